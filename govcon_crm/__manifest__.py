@@ -29,6 +29,7 @@
     'data': [
         'security/ir.model.access.csv',
         'data/tender_data.xml',
+        'data/cron_jobs.xml',
         'views/tender_views.xml',
         'views/tender_type_views.xml',
         'views/document_views.xml',
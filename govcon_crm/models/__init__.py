@@ -1,11 +1,16 @@
 from . import tender
+from . import tender_dedupe
+from . import unspsc_price_stats
 from . import tender_type
 from . import tender_stage
 from . import tender_dates
+from . import tender_pipeline
 from . import tender_tag
 from . import tender_category
 from . import tender_team
 from . import tender_document
 from . import document_templates
 from . import sync_service
-from . import email_processor 
\ No newline at end of file
+from . import sync_job
+from . import email_processor
+from . import email_log 
\ No newline at end of file
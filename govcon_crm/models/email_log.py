@@ -0,0 +1,33 @@
+from odoo import models, fields, api, _
+
+class GovconEmailLog(models.Model):
+    _name = 'govcon.email.log'
+    _description = 'Processed Tender Email'
+    _order = 'id desc'
+    _rec_name = 'email_subject'
+
+    processor_id = fields.Many2one('govcon.email.processor', string='Email Processor', required=True, ondelete='cascade', index=True)
+
+    # Email Content Fields
+    email_subject = fields.Char('Email Subject')
+    email_body = fields.Html('Email Body')
+    email_date = fields.Datetime('Email Date')
+    sender_email = fields.Char('Sender Email')
+    sender_name = fields.Char('Sender Name')
+
+    # Extracted Data (first tender of the email)
+    extracted_tender_id = fields.Char('Extracted Tender ID', index=True)
+    extracted_entity = fields.Char('Extracted Entity')
+    extracted_description = fields.Text('Extracted Description')
+    extracted_value = fields.Float('Extracted Value')
+    extracted_deadline = fields.Date('Extracted Deadline')
+    extracted_url = fields.Char('Extracted URL')
+
+    # Processing Result
+    processing_status = fields.Selection([
+        ('completed', 'Completed'),
+        ('error', 'Error')
+    ], string='Processing Status', required=True, default='completed')
+    processing_message = fields.Text('Processing Message')
+    tender_ids = fields.Many2many('govcon.tender', 'govcon_email_log_tender_rel', 'log_id', 'tender_id', string='Created Tenders')
+    tender_count = fields.Integer('Tenders Created', default=0)
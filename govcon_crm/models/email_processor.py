@@ -1,12 +1,247 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from .tender_dedupe import EMAIL_TENDER_PREFIX
 import logging
 import re
-from datetime import datetime
+import bisect
+import email
+import html
+import imaplib
+import os
+import threading
+import uuid
+from email import policy
+from email.utils import parseaddr, parsedate_to_datetime
+from datetime import datetime, timezone
 import pytz
 
 _logger = logging.getLogger(__name__)
 
+# Extraction patterns as (keyword, value pattern) per field, in priority order.
+# The first pattern of a field that matches anywhere in the email wins.
+EXTRACTION_PATTERNS = [
+    ('extracted_tender_id', [
+        ('tender', r'[:\s]*([A-Z0-9\-]+)'),
+        ('licitación', r'[:\s]*([A-Z0-9\-]+)'),
+        ('convocatoria', r'[:\s]*([A-Z0-9\-]+)'),
+        ('ID', r'[:\s]*([A-Z0-9\-]+)'),
+        ('Reference', r'[:\s]*([A-Z0-9\-]+)'),
+    ]),
+    ('extracted_entity', [
+        ('entidad', r'[:\s]*([^,\n]+)'),
+        ('entity', r'[:\s]*([^,\n]+)'),
+        ('procuring', r'[:\s]*([^,\n]+)'),
+        ('organismo', r'[:\s]*([^,\n]+)'),
+    ]),
+    ('extracted_value', [
+        ('valor', r'[:\s]*\$?([0-9,]+\.?[0-9]*)'),
+        ('value', r'[:\s]*\$?([0-9,]+\.?[0-9]*)'),
+        ('monto', r'[:\s]*\$?([0-9,]+\.?[0-9]*)'),
+        ('amount', r'[:\s]*\$?([0-9,]+\.?[0-9]*)'),
+    ]),
+    ('extracted_deadline', [
+        ('fecha límite', r'[:\s]*([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4})'),
+        ('deadline', r'[:\s]*([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4})'),
+        ('fecha de cierre', r'[:\s]*([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4})'),
+        ('closing date', r'[:\s]*([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4})'),
+    ]),
+]
+
+# keyword -> [(field, priority, compiled value pattern)]
+_KEYWORD_PATTERNS = {}
+for _field, _patterns in EXTRACTION_PATTERNS:
+    for _priority, (_keyword, _value_pattern) in enumerate(_patterns):
+        _KEYWORD_PATTERNS.setdefault(_keyword.lower(), []).append(
+            (_field, _priority, re.compile(_value_pattern, re.IGNORECASE)))
+
+# Group name -> keyword; the matched text can differ from the keyword by
+# Unicode case folding (e.g. 'İD' or 'cloſing'), so hits are resolved by group
+_KEYWORD_GROUPS = {
+    f'keyword{index}': keyword
+    for index, keyword in enumerate(sorted(_KEYWORD_PATTERNS, key=len, reverse=True))
+}
+
+# One zero-width scanner over every keyword and URL so overlapping hits are
+# all reported, the text is walked once whatever the number of patterns.
+_TOKEN_RE = re.compile(
+    r'(?=%s|(?P<url>(?-i:https?://)[^\s<>"]+))' % '|'.join(
+        f'(?P<{group}>{re.escape(keyword)})' for group, keyword in _KEYWORD_GROUPS.items()),
+    re.IGNORECASE,
+)
+_HTML_LINK_RE = re.compile(r'<a\s[^>]*?href\s*=\s*["\']([^"\']+)["\'][^>]*>', re.IGNORECASE)
+_HTML_RULE_RE = re.compile(r'<\s*hr\b[^>]*>', re.IGNORECASE)
+_HTML_BREAK_RE = re.compile(r'<\s*(?:br|/p|/div|/tr|/li|/h[1-6])\s*/?\s*>', re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_HTML_SKIP_RE = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+
+
+def _normalize_email_text(body):
+    """Turn an HTML or plain text body into plain text lines
+
+    Link targets are kept inline so their URLs can still be extracted.
+    Plain text bodies are returned unchanged.
+    """
+    if not body or '<' not in body:
+        return body or ''
+    text = _HTML_SKIP_RE.sub(' ', body)
+    text = _HTML_LINK_RE.sub(lambda match: ' %s ' % match.group(1), text)
+    text = _HTML_RULE_RE.sub('\n---\n', text)
+    text = _HTML_BREAK_RE.sub('\n', text)
+    text = _HTML_TAG_RE.sub('', text)
+    return html.unescape(text)
+
+
+def _scan_tokens(text, first_only=True):
+    """Walk text once and return the pattern hits found in it
+
+    Returns ([(position, field, priority, value)], [(position, url)]) in
+    text order. With first_only, only the first hit of each pattern and
+    the first URL are kept.
+    """
+    hits = []
+    urls = []
+    seen = set()
+    for token in _TOKEN_RE.finditer(text):
+        if token.lastgroup == 'url':
+            if not (first_only and urls):
+                urls.append((token.start(), token.group('url')))
+            continue
+        end = token.end(token.lastgroup)
+        for field, priority, value_re in _KEYWORD_PATTERNS[_KEYWORD_GROUPS[token.lastgroup]]:
+            if first_only and (field, priority) in seen:
+                continue
+            value_match = value_re.match(text, end)
+            if value_match:
+                seen.add((field, priority))
+                hits.append((token.start(), field, priority, value_match.group(1)))
+    return hits, urls
+
+
+def _resolve_fields(hits, urls):
+    """Pick each field from its first hit in pattern priority order"""
+    matches = {}
+    for position, field, priority, value in hits:
+        matches.setdefault((field, priority), value)
+    
+    extracted_data = {}
+    for field, patterns in EXTRACTION_PATTERNS:
+        for priority in range(len(patterns)):
+            value = matches.get((field, priority))
+            if value is None:
+                continue
+            if field == 'extracted_value':
+                try:
+                    extracted_data[field] = float(value.replace(',', ''))
+                except ValueError:
+                    continue
+            elif field == 'extracted_deadline':
+                # Parse date (simplified - you might need more robust date parsing)
+                parts = value.split('/') if '/' in value else value.split('-')
+                if len(parts) == 3:
+                    if len(parts[2]) == 2:
+                        parts[2] = '20' + parts[2]
+                    extracted_data[field] = f"{parts[2]}-{parts[1]}-{parts[0]}"
+            elif field == 'extracted_entity':
+                extracted_data[field] = value.strip()
+            else:
+                extracted_data[field] = value
+            break
+    
+    if urls:
+        extracted_data['extracted_url'] = urls[0][1]
+    return extracted_data
+
+
+def _scan_tender_fields(text):
+    """Extract tender fields from text in a single scan
+
+    Returns the same values as searching each pattern separately in
+    priority order.
+    """
+    return _resolve_fields(*_scan_tokens(text))
+
+
+def _extract_description(body):
+    """First meaningful line of a body, used as tender description"""
+    for line in body.split('\n'):
+        if len(line.strip()) > 20 and not line.startswith('http'):
+            return line.strip()[:500]
+    return None
+
+
+_IMAP_UID_RE = re.compile(rb'UID (\d+)')
+
+
+def _parse_email_message(raw_message):
+    """Turn a raw RFC 822 message into the email_data dict used for processing"""
+    message = email.message_from_bytes(raw_message, policy=policy.default)
+    sender_name, sender_email = parseaddr(str(message.get('From', '')))
+    email_date = False
+    if message.get('Date'):
+        try:
+            email_date = parsedate_to_datetime(str(message['Date']))
+            if email_date.tzinfo:
+                email_date = email_date.astimezone(timezone.utc).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            email_date = False
+    body_part = message.get_body(preferencelist=('html', 'plain'))
+    return {
+        'subject': str(message.get('Subject', '')),
+        'body': body_part.get_content() if body_part else '',
+        'date': email_date,
+        'sender_email': sender_email,
+        'sender_name': sender_name,
+    }
+
+
+_SEPARATOR_RE = re.compile(r'^\s*(?:[-=*_~]\s*){3,}$', re.MULTILINE)
+_LINE_LEAD_RE = re.compile(r'[\s\-*#>\u2022\d.)]*')
+
+
+def _split_digest(body):
+    """Split a digest body into per-tender blocks with their fields
+
+    Notices are delimited by separator lines when the email has any,
+    otherwise by lines starting with a tender ID keyword. The body is
+    scanned once and every hit is assigned to the block it falls in.
+    Returns a list of extracted_data dicts, one per block with a tender ID.
+    """
+    hits, urls = _scan_tokens(body, first_only=False)
+    
+    boundaries = [match.end() for match in _SEPARATOR_RE.finditer(body)]
+    skip_preamble = not boundaries
+    if not boundaries:
+        for position, field, priority, value in hits:
+            if field != 'extracted_tender_id':
+                continue
+            line_start = body.rfind('\n', 0, position) + 1
+            if _LINE_LEAD_RE.fullmatch(body, line_start, position):
+                boundaries.append(line_start)
+    # Text before the first tender ID line is an introduction, not a notice
+    skip_preamble = skip_preamble and boundaries and min(boundaries) > 0
+    boundaries = sorted(set([0] + boundaries))
+    
+    blocks = [([], []) for boundary in boundaries]
+    for hit in hits:
+        blocks[bisect.bisect_right(boundaries, hit[0]) - 1][0].append(hit)
+    for url in urls:
+        blocks[bisect.bisect_right(boundaries, url[0]) - 1][1].append(url)
+    
+    tenders = []
+    for index, (block_hits, block_urls) in enumerate(blocks):
+        if index == 0 and skip_preamble:
+            continue
+        extracted_data = _resolve_fields(block_hits, block_urls)
+        if not extracted_data.get('extracted_tender_id'):
+            continue
+        block_end = boundaries[index + 1] if index + 1 < len(boundaries) else len(body)
+        description = _extract_description(body[boundaries[index]:block_end])
+        if description:
+            extracted_data['extracted_description'] = description
+        tenders.append(extracted_data)
+    return tenders
+
+
 class GovconEmailProcessor(models.Model):
     _name = 'govcon.email.processor'
     _description = 'Email Processor for Government Tenders'
@@ -20,26 +255,29 @@ class GovconEmailProcessor(models.Model):
     auto_classify_tenders = fields.Boolean('Auto-classify Tenders', default=True)
     auto_create_tenders = fields.Boolean('Auto-create Tenders', default=True)
     notification_enabled = fields.Boolean('Enable Notifications', default=True)
+    # Mailbox Configuration
+    mailbox_type = fields.Selection([
+        ('imap', 'IMAP'),
+        ('maildir', 'Local Maildir')
+    ], string='Mailbox Type', default='imap')
+    imap_server = fields.Char('IMAP Server')
+    imap_port = fields.Integer('IMAP Port', default=993)
+    imap_ssl = fields.Boolean('IMAP SSL', default=True)
+    imap_user = fields.Char('IMAP User')
+    imap_password = fields.Char('IMAP Password')
+    imap_folder = fields.Char('IMAP Folder', default='INBOX')
+    maildir_path = fields.Char('Maildir Path', help="Local Maildir, mainly for testing")
+    batch_size = fields.Integer('Batch Size', default=100, help="Messages processed per commit")
+    # Unsigned 32-bit IMAP values, stored as text since they may not fit an int4 column
+    imap_uid_validity = fields.Char('IMAP UIDVALIDITY', readonly=True, copy=False)
+    imap_last_uid = fields.Char('Last Processed IMAP UID', readonly=True, copy=False)
+    digest_mode = fields.Boolean('Digest Mode', default=False, help="Extract every tender listed in an email instead of the first one")
     
-    # Processing Statistics
-    total_emails_processed = fields.Integer('Total Emails Processed', default=0)
-    total_tenders_created = fields.Integer('Total Tenders Created', default=0)
-    last_processing_date = fields.Datetime('Last Processing Date', readonly=True)
-    
-    # Email Content Fields
-    email_subject = fields.Char('Email Subject')
-    email_body = fields.Html('Email Body')
-    email_date = fields.Datetime('Email Date')
-    sender_email = fields.Char('Sender Email')
-    sender_name = fields.Char('Sender Name')
-    
-    # Extracted Data
-    extracted_tender_id = fields.Char('Extracted Tender ID')
-    extracted_entity = fields.Char('Extracted Entity')
-    extracted_description = fields.Text('Extracted Description')
-    extracted_value = fields.Float('Extracted Value')
-    extracted_deadline = fields.Date('Extracted Deadline')
-    extracted_url = fields.Char('Extracted URL')
+    # Processing Statistics (aggregated from the email log)
+    email_log_ids = fields.One2many('govcon.email.log', 'processor_id', string='Processed Emails')
+    total_emails_processed = fields.Integer('Total Emails Processed', compute='_compute_processing_stats')
+    total_tenders_created = fields.Integer('Total Tenders Created', compute='_compute_processing_stats')
+    last_processing_date = fields.Datetime('Last Processing Date', compute='_compute_processing_stats')
     
     # Processing Status
     processing_status = fields.Selection([
@@ -50,248 +288,413 @@ class GovconEmailProcessor(models.Model):
     ], string='Processing Status', default='pending')
     processing_message = fields.Text('Processing Message')
 
+    def _compute_processing_stats(self):
+        """Aggregate the email log of all processors with one read_group"""
+        stats = {
+            group['processor_id'][0]: group
+            for group in self.env['govcon.email.log'].read_group(
+                [('processor_id', 'in', self.ids)],
+                ['processor_id', 'tender_count:sum', 'create_date:max'],
+                ['processor_id'],
+            )
+        }
+        for processor in self:
+            group = stats.get(processor.id, {})
+            processor.total_emails_processed = group.get('processor_id_count', 0)
+            processor.total_tenders_created = group.get('tender_count', 0)
+            processor.last_processing_date = group.get('create_date', False)
+
     def process_email_content(self, email_data):
         """Process email content and extract tender information"""
         self.ensure_one()
         
         try:
-            self.write({
-                'processing_status': 'processing',
+            return self._process_emails([email_data])
+        except Exception as e:
+            _logger.error(f"Error processing email: {str(e)}")
+            raise ValidationError(_('Email processing failed: %s') % str(e))
+
+    def _process_emails(self, email_data_list, notify=True):
+        """Process a batch of emails and append one govcon.email.log row per email
+
+        Tenders of the whole batch are created together and the log rows are
+        inserted with a single create, the processor record itself is not
+        written so concurrent workers do not contend on its row. With notify
+        False the caller sends the notifications for the created tenders.
+        """
+        self.ensure_one()
+        log_vals_list = []
+        extracted_lists = []
+        for email_data in email_data_list:
+            log_vals = {
+                'processor_id': self.id,
                 'email_subject': email_data.get('subject', ''),
                 'email_body': email_data.get('body', ''),
                 'email_date': email_data.get('date'),
                 'sender_email': email_data.get('sender_email'),
-                'sender_name': email_data.get('sender_name')
-            })
-            
-            # Extract tender information
-            extracted_data = self._extract_tender_data(email_data)
-            
-            if extracted_data:
-                self.write(extracted_data)
-                
-                # Auto-create tender if enabled
-                if self.auto_create_tenders:
-                    tender = self._create_tender_from_email(extracted_data)
-                    if tender:
-                        self.total_tenders_created += 1
-                        self._send_notification(tender)
-                
-                self.processing_status = 'completed'
-                self.processing_message = 'Email processed successfully'
+                'sender_name': email_data.get('sender_name'),
+            }
+            extracted_list = self._extract_email_tenders(email_data)
+            if extracted_list:
+                log_vals.update(extracted_list[0])
+                log_vals.update(processing_status='completed', processing_message='Email processed successfully')
             else:
-                self.processing_status = 'error'
-                self.processing_message = 'No tender information found in email'
-            
-            self.total_emails_processed += 1
-            self.last_processing_date = fields.Datetime.now()
-            
-        except Exception as e:
-            _logger.error(f"Error processing email: {str(e)}")
-            self.processing_status = 'error'
-            self.processing_message = str(e)
-            raise ValidationError(_('Email processing failed: %s') % str(e))
+                log_vals.update(processing_status='error', processing_message='No tender information found in email')
+            log_vals_list.append(log_vals)
+            extracted_lists.append(extracted_list)
+        
+        # Auto-create tender if enabled
+        tenders = self.env['govcon.tender']
+        if self.auto_create_tenders:
+            created_tenders = self._create_tenders_from_email([
+                extracted_data for extracted_list in extracted_lists for extracted_data in extracted_list
+            ])
+            # Created tenders come back in extraction order, each email takes its slice
+            position = 0
+            for log_vals, extracted_list in zip(log_vals_list, extracted_lists):
+                email_tenders = self.env['govcon.tender'].union(*created_tenders[position:position + len(extracted_list)])
+                position += len(extracted_list)
+                tenders |= email_tenders
+                log_vals['tender_ids'] = [(6, 0, email_tenders.ids)]
+                log_vals['tender_count'] = len(email_tenders)
+        
+        logs = self.env['govcon.email.log'].create(log_vals_list)
+        if notify:
+            self._send_notifications(tenders)
+        return logs
+
+    def _extract_email_tenders(self, email_data):
+        """Extracted data of every tender in an email, every listed one in digest mode"""
+        extracted_list = self._extract_digest_tenders(email_data) if self.digest_mode else []
+        if len(extracted_list) <= 1:
+            extracted_data = self._extract_tender_data(email_data)
+            extracted_list = [extracted_data] if extracted_data else []
+        
+        # Drop impossible dates (e.g. 31/02) so one bad email cannot fail the batch
+        for extracted_data in extracted_list:
+            if extracted_data.get('extracted_deadline'):
+                try:
+                    fields.Date.to_date(extracted_data['extracted_deadline'])
+                except ValueError:
+                    del extracted_data['extracted_deadline']
+        return extracted_list
 
     def _extract_tender_data(self, email_data):
         """Extract tender data from email content"""
         subject = email_data.get('subject', '')
-        body = email_data.get('body', '')
-        
-        extracted_data = {}
-        
-        # Extract tender ID (common patterns)
-        tender_id_patterns = [
-            r'tender[:\s]*([A-Z0-9\-]+)',
-            r'licitación[:\s]*([A-Z0-9\-]+)',
-            r'convocatoria[:\s]*([A-Z0-9\-]+)',
-            r'ID[:\s]*([A-Z0-9\-]+)',
-            r'Reference[:\s]*([A-Z0-9\-]+)'
-        ]
-        
-        for pattern in tender_id_patterns:
-            match = re.search(pattern, subject + ' ' + body, re.IGNORECASE)
-            if match:
-                extracted_data['extracted_tender_id'] = match.group(1)
-                break
+        body = _normalize_email_text(email_data.get('body', ''))
         
-        # Extract procuring entity
-        entity_patterns = [
-            r'entidad[:\s]*([^,\n]+)',
-            r'entity[:\s]*([^,\n]+)',
-            r'procuring[:\s]*([^,\n]+)',
-            r'organismo[:\s]*([^,\n]+)'
-        ]
-        
-        for pattern in entity_patterns:
-            match = re.search(pattern, subject + ' ' + body, re.IGNORECASE)
-            if match:
-                extracted_data['extracted_entity'] = match.group(1).strip()
-                break
+        extracted_data = _scan_tender_fields(subject + ' ' + body)
         
         # Extract description
         if body:
             # Try to extract description from email body
-            lines = body.split('\n')
-            for line in lines:
-                if len(line.strip()) > 20 and not line.startswith('http'):
-                    extracted_data['extracted_description'] = line.strip()[:500]
-                    break
-        
-        # Extract value
-        value_patterns = [
-            r'valor[:\s]*\$?([0-9,]+\.?[0-9]*)',
-            r'value[:\s]*\$?([0-9,]+\.?[0-9]*)',
-            r'monto[:\s]*\$?([0-9,]+\.?[0-9]*)',
-            r'amount[:\s]*\$?([0-9,]+\.?[0-9]*)'
-        ]
-        
-        for pattern in value_patterns:
-            match = re.search(pattern, subject + ' ' + body, re.IGNORECASE)
-            if match:
-                try:
-                    value_str = match.group(1).replace(',', '')
-                    extracted_data['extracted_value'] = float(value_str)
-                    break
-                except ValueError:
-                    continue
-        
-        # Extract deadline
-        deadline_patterns = [
-            r'fecha límite[:\s]*([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4})',
-            r'deadline[:\s]*([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4})',
-            r'fecha de cierre[:\s]*([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4})',
-            r'closing date[:\s]*([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4})'
-        ]
-        
-        for pattern in deadline_patterns:
-            match = re.search(pattern, subject + ' ' + body, re.IGNORECASE)
-            if match:
-                try:
-                    date_str = match.group(1)
-                    # Parse date (simplified - you might need more robust date parsing)
-                    if '/' in date_str:
-                        parts = date_str.split('/')
-                    else:
-                        parts = date_str.split('-')
-                    
-                    if len(parts) == 3:
-                        if len(parts[2]) == 2:
-                            parts[2] = '20' + parts[2]
-                        extracted_data['extracted_deadline'] = f"{parts[2]}-{parts[1]}-{parts[0]}"
-                    break
-                except Exception:
-                    continue
-        
-        # Extract URL
-        url_pattern = r'https?://[^\s<>"]+'
-        match = re.search(url_pattern, subject + ' ' + body)
-        if match:
-            extracted_data['extracted_url'] = match.group(0)
+            description = _extract_description(body)
+            if description:
+                extracted_data['extracted_description'] = description
         
         return extracted_data
 
-    def _create_tender_from_email(self, extracted_data):
-        """Create tender record from extracted email data"""
+    def _extract_digest_tenders(self, email_data):
+        """Extract every tender listed in a digest email, one dict per tender"""
+        return _split_digest(_normalize_email_text(email_data.get('body', '')))
+
+    def _create_tenders_from_email(self, extracted_list):
+        """Create the tenders of a batch of extracted data in a single create
+
+        Tender IDs already known are looked up once for the whole batch and
+        skipped; an ID repeated within the batch is only created for its
+        first occurrence, so a tender listed in several emails is credited
+        to the first one. Returns a list aligned with extracted_list holding
+        the tender created for each item, or an empty recordset.
+        """
+        Tender = self.env['govcon.tender']
+        vals_list = [self._prepare_tender_vals_from_email(extracted_data) for extracted_data in extracted_list]
+        known_ids = set(Tender.search([
+            ('tender_id', 'in', [tender_vals['tender_id'] for tender_vals in vals_list]),
+        ]).mapped('tender_id'))
+        create_indexes = []
+        for index, tender_vals in enumerate(vals_list):
+            if tender_vals['tender_id'] not in known_ids:
+                known_ids.add(tender_vals['tender_id'])
+                create_indexes.append(index)
+        
+        created_tenders = [Tender] * len(vals_list)
+        if not create_indexes:
+            return created_tenders
         try:
-            # Map extracted data to tender fields
-            tender_vals = {
-                'tender_id': extracted_data.get('extracted_tender_id', f"EMAIL_{fields.Datetime.now().strftime('%Y%m%d_%H%M%S')}"),
-                'procuring_entity': extracted_data.get('extracted_entity', ''),
-                'description': extracted_data.get('extracted_description', ''),
-                'tender_value': extracted_data.get('extracted_value', 0.0),
-                'tender_url': extracted_data.get('extracted_url', ''),
-                'state': 'draft',
-                'user_id': self.env.user.id,
-            }
-            
-            # Set deadline if available
-            if extracted_data.get('extracted_deadline'):
-                tender_vals['date_deadline'] = extracted_data['extracted_deadline']
-            
-            # Auto-classify tender type if enabled
-            if self.auto_classify_tenders:
-                tender_type = self._classify_tender_type(extracted_data)
-                if tender_type:
-                    tender_vals['tender_type_id'] = tender_type.id
-            
-            # Create tender
-            tender = self.env['govcon.tender'].create(tender_vals)
-            
-            _logger.info(f"Created tender {tender.tender_id} from email")
-            return tender
-            
+            tenders = Tender.create([vals_list[index] for index in create_indexes])
+            _logger.info(f"Created {len(tenders)} tenders from email")
         except Exception as e:
-            _logger.error(f"Error creating tender from email: {str(e)}")
+            _logger.error(f"Error creating tenders from email: {str(e)}")
             raise
+        for index, tender in zip(create_indexes, tenders):
+            created_tenders[index] = tender
+        return created_tenders
+
+    def _prepare_tender_vals_from_email(self, extracted_data):
+        """Map extracted email data to tender fields"""
+        # Map extracted data to tender fields
+        tender_vals = {
+            'tender_id': extracted_data.get('extracted_tender_id') or self._get_email_tender_fallback_id(),
+            'procuring_entity': extracted_data.get('extracted_entity', ''),
+            'description': extracted_data.get('extracted_description', ''),
+            'tender_value': extracted_data.get('extracted_value', 0.0),
+            'tender_url': extracted_data.get('extracted_url', ''),
+            'state': 'draft',
+            'user_id': self.env.user.id,
+        }
+        
+        # Set deadline if available
+        if extracted_data.get('extracted_deadline'):
+            tender_vals['date_deadline'] = extracted_data['extracted_deadline']
+        
+        # Auto-classify tender type if enabled
+        if self.auto_classify_tenders:
+            tender_type = self._classify_tender_type(extracted_data)
+            if tender_type:
+                tender_vals['tender_type_id'] = tender_type.id
+        
+        return tender_vals
+
+    def _get_email_tender_fallback_id(self):
+        """Unique tender ID for an email tender without an extracted ID"""
+        return f"{EMAIL_TENDER_PREFIX}{fields.Datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
 
     def _classify_tender_type(self, extracted_data):
         """Auto-classify tender type based on content"""
-        description = (extracted_data.get('extracted_description', '') + 
-                      extracted_data.get('email_subject', '')).lower()
-        
-        # Simple classification logic
-        if any(word in description for word in ['construcción', 'construction', 'obra', 'building']):
-            return self.env['govcon.tender.type'].search([('name', 'ilike', 'construction')], limit=1)
-        elif any(word in description for word in ['servicio', 'service', 'consultoría', 'consulting']):
-            return self.env['govcon.tender.type'].search([('name', 'ilike', 'service')], limit=1)
-        elif any(word in description for word in ['bien', 'goods', 'equipo', 'equipment', 'suministro', 'supply']):
-            return self.env['govcon.tender.type'].search([('name', 'ilike', 'goods')], limit=1)
-        else:
-            return self.env['govcon.tender.type'].search([('is_default', '=', True)], limit=1)
+        description = ' '.join([
+            extracted_data.get('extracted_description') or '',
+            extracted_data.get('email_subject') or '',
+        ])
+        return self.env['govcon.tender.type']._classify_text(description)
 
-    def _send_notification(self, tender):
-        """Send notification about new tender creation"""
-        if not self.notification_enabled:
+    def _send_notifications(self, tenders):
+        """Notify about a run of new tenders with batched activities and per-user digests
+
+        The activity type and model are resolved once, every activity is
+        created in one call without the per-activity assignment email, and
+        each assigned user gets a single message listing their new tenders.
+        """
+        if not self.notification_enabled or not tenders:
             return
         
         try:
-            # Create activity for assigned user
-            self.env['mail.activity'].create({
-                'activity_type_id': self.env.ref('mail.mail_activity_data_todo').id,
-                'note': f'New tender created from email: {tender.tender_id}',
-                'res_id': tender.id,
-                'res_model_id': self.env['ir.model']._get('govcon.tender').id,
-                'user_id': tender.user_id.id,
-                'date_deadline': fields.Date.today(),
-            })
+            with self.env.cr.savepoint():
+                # Create activities for assigned users
+                activity_type_id = self.env.ref('mail.mail_activity_data_todo').id
+                res_model_id = self.env['ir.model']._get_id('govcon.tender')
+                today = fields.Date.today()
+                self.env['mail.activity'].with_context(mail_activity_quick_update=True).create([{
+                    'activity_type_id': activity_type_id,
+                    'note': f'New tender created from email: {tender.tender_id}',
+                    'res_id': tender.id,
+                    'res_model_id': res_model_id,
+                    'user_id': tender.user_id.id,
+                    'date_deadline': today,
+                } for tender in tenders])
             
-            # Send internal message
-            tender.message_post(
-                body=f'Tender created from email notification. Source: {self.email_address}',
-                subject=f'New Tender: {tender.tender_id}'
-            )
+                # Log the source on every tender with a single message create
+                body = f'Tender created from email notification. Source: {html.escape(self.email_address or "")}'
+                tenders._message_log_batch({tender.id: body for tender in tenders})
+            
+                # One digest per assigned user
+                tenders_by_user = {}
+                for tender in tenders:
+                    tenders_by_user.setdefault(tender.user_id, []).append(tender)
+                for user, user_tenders in tenders_by_user.items():
+                    if not user.partner_id:
+                        continue
+                    items = ''.join(
+                        f"<li>{html.escape(tender.tender_id or '')}: {html.escape(tender.description or '')}</li>"
+                        for tender in user_tenders
+                    )
+                    self.message_notify(
+                        partner_ids=user.partner_id.ids,
+                        subject=_('%d new tenders from %s') % (len(user_tenders), self.name),
+                        body=f"<ul>{items}</ul>",
+                    )
             
         except Exception as e:
             _logger.error(f"Error sending notification: {str(e)}")
 
     def action_process_emails(self):
         """Manual action to process emails"""
-        # This would typically be called by a cron job or external system
-        # For now, it's a placeholder for manual processing
+        processed_count = 0
+        for processor in self:
+            processed_count += processor._process_mailbox()
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
             'params': {
                 'title': _('Email Processing'),
-                'message': _('Email processing completed'),
+                'message': _('Email processing completed: %d emails processed') % processed_count,
                 'type': 'success',
             }
         }
 
+    def _process_mailbox(self):
+        """Pull new messages from the mailbox and process them batch by batch
+
+        The processed position (IMAP UID or Maildir flag) only moves after
+        the batch is committed, with at most one commit per batch, so no
+        message is parsed twice and a crash only replays the current batch.
+        A message whose processing raised is not acknowledged: it stays in
+        Maildir new/, while an IMAP run stops before it since the UID mark
+        cannot skip it. Either way it is retried by the next run. Returns
+        the number of emails processed.
+        """
+        self.ensure_one()
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        if self.mailbox_type == 'maildir':
+            batches = self._fetch_maildir_batches()
+        else:
+            batches = self._fetch_imap_batches()
+        
+        stop_at_failure = self.mailbox_type != 'maildir'
+        processed_count = 0
+        tenders = self.env['govcon.tender']
+        for batch, acknowledge in batches:
+            failed_keys = []
+            try:
+                with self.env.cr.savepoint():
+                    logs = self._process_emails([email_data for key, email_data in batch], notify=False)
+                    tenders |= logs.mapped('tender_ids')
+                processed_count += len(batch)
+            except Exception as e:
+                # Isolate the failing message(s) by replaying the batch one by one
+                _logger.warning(f"Batch processing failed for {self.name}, retrying per email: {str(e)}")
+                for key, email_data in batch:
+                    try:
+                        with self.env.cr.savepoint():
+                            logs = self._process_emails([email_data], notify=False)
+                            tenders |= logs.mapped('tender_ids')
+                        processed_count += 1
+                    except Exception as e:
+                        _logger.error(f"Error processing email {key} for {self.name}: {str(e)}")
+                        failed_keys.append(key)
+                        if stop_at_failure:
+                            break
+            acknowledge(auto_commit, failed_keys)
+            if failed_keys and stop_at_failure:
+                _logger.error(f"Stopped processing {self.name} at email {failed_keys[0]}, it is retried by the next run")
+                break
+        
+        # Notify once for the whole run
+        self._send_notifications(tenders)
+        if auto_commit:
+            self.env.cr.commit()
+        return processed_count
+
+    def _fetch_imap_batches(self):
+        """Yield (messages, acknowledge) batches of unseen IMAP messages by UID
+
+        Only UIDs above imap_last_uid are fetched; the mark is reset when the
+        folder UIDVALIDITY changes. acknowledge moves the mark up to the
+        first failed message of the batch, excluded.
+        """
+        imap_class = imaplib.IMAP4_SSL if self.imap_ssl else imaplib.IMAP4
+        connection = imap_class(self.imap_server, self.imap_port)
+        try:
+            connection.login(self.imap_user, self.imap_password)
+            connection.select(self.imap_folder or 'INBOX', readonly=True)
+            uid_validity = int((connection.response('UIDVALIDITY')[1] or [0])[0] or 0)
+            last_uid = int(self.imap_last_uid or 0) if uid_validity == int(self.imap_uid_validity or 0) else 0
+            
+            typ, data = connection.uid('search', None, 'UID %d:*' % (last_uid + 1))
+            # "n:*" always matches the last message, even below n
+            uids = sorted(uid for uid in map(int, (data[0] or b'').split()) if uid > last_uid)
+            batch_size = self.batch_size or 100
+            for start in range(0, len(uids), batch_size):
+                batch_uids = uids[start:start + batch_size]
+                typ, data = connection.uid('fetch', ','.join(map(str, batch_uids)), '(RFC822)')
+                batch = []
+                for item in data:
+                    if not isinstance(item, tuple):
+                        continue
+                    uid_match = _IMAP_UID_RE.search(item[0])
+                    uid = uid_match and int(uid_match.group(1))
+                    email_data = self._parse_mailbox_message(uid, item[1])
+                    if email_data:
+                        batch.append((uid, email_data))
+                
+                def acknowledge(auto_commit, failed_keys, batch_uids=batch_uids):
+                    # A failed message whose UID was not reported holds back the whole batch
+                    done_uids = [
+                        uid for uid in batch_uids
+                        if not failed_keys or (None not in failed_keys and uid < min(failed_keys))
+                    ]
+                    if done_uids:
+                        self.write({'imap_uid_validity': str(uid_validity), 'imap_last_uid': str(done_uids[-1])})
+                    if auto_commit:
+                        self.env.cr.commit()
+                yield batch, acknowledge
+        finally:
+            try:
+                connection.logout()
+            except Exception:
+                pass
+
+    def _fetch_maildir_batches(self):
+        """Yield (messages, acknowledge) batches of new messages from a Maildir
+
+        Messages are moved from new/ to cur/ with the Seen flag once their
+        batch is committed, except the failed ones.
+        """
+        new_dir = os.path.join(self.maildir_path, 'new')
+        cur_dir = os.path.join(self.maildir_path, 'cur')
+        filenames = sorted(name for name in os.listdir(new_dir) if not name.startswith('.'))
+        batch_size = self.batch_size or 100
+        for start in range(0, len(filenames), batch_size):
+            batch_filenames = filenames[start:start + batch_size]
+            batch = []
+            for filename in batch_filenames:
+                with open(os.path.join(new_dir, filename), 'rb') as message_file:
+                    email_data = self._parse_mailbox_message(filename, message_file.read())
+                if email_data:
+                    batch.append((filename, email_data))
+            
+            def acknowledge(auto_commit, failed_keys, batch_filenames=batch_filenames):
+                if auto_commit:
+                    self.env.cr.commit()
+                for filename in batch_filenames:
+                    if filename in failed_keys:
+                        continue
+                    os.rename(os.path.join(new_dir, filename),
+                              os.path.join(cur_dir, filename.split(':')[0] + ':2,S'))
+            yield batch, acknowledge
+
+    def _parse_mailbox_message(self, key, raw_message):
+        """Parse one fetched message, None when it is malformed
+
+        Unparsable messages (e.g. an unknown charset) are logged and left
+        out of their batch, which still acknowledges them.
+        """
+        try:
+            return _parse_email_message(raw_message)
+        except Exception as e:
+            _logger.error(f"Skipping unparsable email {key} for {self.name}: {str(e)}")
+            return None
+
     @api.model
     def _cron_process_emails(self):
         """Cron job for automatic email processing"""
-        active_processors = self.search([('is_active', '=', True)])
+        # Processors without a configured mailbox only handle pushed emails
+        active_processors = self.search([
+            ('is_active', '=', True),
+            '|',
+            '&', ('mailbox_type', '=', 'imap'), ('imap_server', '!=', False),
+            '&', ('mailbox_type', '=', 'maildir'), ('maildir_path', '!=', False),
+        ])
         
         for processor in active_processors:
             try:
-                # This would typically fetch emails from the configured email address
-                # For now, it's a placeholder
                 _logger.info(f"Processing emails for {processor.name}")
+                processor._process_mailbox()
                 
             except Exception as e:
                 _logger.error(f"Error processing emails for {processor.name}: {str(e)}")
                 processor.write({
                     'processing_status': 'error',
                     'processing_message': str(e)
-                }) 
\ No newline at end of file
+                })
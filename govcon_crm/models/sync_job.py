@@ -0,0 +1,145 @@
+from odoo import models, fields, api, _
+import logging
+import threading
+import time
+from datetime import timedelta
+
+_logger = logging.getLogger(__name__)
+
+# Delay before the first retry, doubled on every further attempt
+RETRY_BASE_SECONDS = 60
+
+# Time a queue run may keep claiming jobs, below the cron interval
+CRON_TIME_BUDGET_SECONDS = 240
+
+class GovconSyncJob(models.Model):
+    _name = 'govcon.sync.job'
+    _description = 'Tender Sync Job'
+    _order = 'id'
+
+    service_id = fields.Many2one('govcon.sync.service', string='Sync Service', required=True, ondelete='cascade', index=True)
+    job_type = fields.Selection([
+        ('page', 'API Page'),
+        ('tender', 'Tender')
+    ], string='Job Type', required=True, default='page')
+    run_start = fields.Datetime('Run Start', required=True, index=True, help="Start of the sync run this job belongs to")
+    payload = fields.Text('Payload', help="JSON page parameters or tender data")
+    tender_ref = fields.Char('Tender ID')
+
+    # Queue State
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed')
+    ], string='Status', default='pending', required=True, index=True)
+    attempt_count = fields.Integer('Attempts', default=0)
+    max_attempts = fields.Integer('Max Attempts', default=5)
+    next_attempt_date = fields.Datetime('Next Attempt', default=fields.Datetime.now, index=True)
+    last_error = fields.Text('Last Error')
+
+    # Results
+    tender_count = fields.Integer('Tenders Fetched', default=0)
+    synced_count = fields.Integer('Tenders Synced', default=0)
+
+    def _run(self):
+        """Run a claimed job, scheduling a retry with backoff when it fails"""
+        self.ensure_one()
+        try:
+            with self.env.cr.savepoint():
+                if self.job_type == 'page':
+                    self.service_id._run_page_job(self)
+                else:
+                    self.service_id._run_tender_job(self)
+            self.write({'state': 'done', 'attempt_count': self.attempt_count + 1, 'last_error': False})
+        except Exception as e:
+            _logger.error(f"Sync job {self.id} ({self.job_type} {self.tender_ref or ''}) failed: {str(e)}")
+            self._schedule_retry(str(e))
+
+    def _schedule_retry(self, error):
+        """Requeue the job with exponential backoff or mark it failed"""
+        attempt_count = self.attempt_count + 1
+        if attempt_count >= self.max_attempts:
+            self.write({'state': 'failed', 'attempt_count': attempt_count, 'last_error': error})
+            return
+        delay = RETRY_BASE_SECONDS * 2 ** (attempt_count - 1)
+        self.write({
+            'state': 'pending',
+            'attempt_count': attempt_count,
+            'last_error': error,
+            'next_attempt_date': fields.Datetime.now() + timedelta(seconds=delay),
+        })
+
+    @api.model
+    def _claim_jobs(self, limit):
+        """Atomically mark up to limit due jobs as running
+
+        SKIP LOCKED keeps concurrent queue runs from picking the same jobs.
+        Odoo never runs one ir.cron record twice at the same time, so the
+        queue is drained in parallel by the several worker crons calling
+        _cron_process_jobs, up to the server's max_cron_threads. Due dates
+        are compared with the server clock that set them, not with the start
+        of the current transaction.
+        """
+        now = fields.Datetime.now()
+        self.env.cr.execute("""
+            UPDATE govcon_sync_job SET state = 'running', write_date = %s
+             WHERE id IN (
+                SELECT id FROM govcon_sync_job
+                 WHERE state = 'pending' AND next_attempt_date <= %s
+                 ORDER BY id
+                 LIMIT %s
+                 FOR UPDATE SKIP LOCKED
+             )
+         RETURNING id
+        """, (now, now, limit))
+        job_ids = [row[0] for row in self.env.cr.fetchall()]
+        self.invalidate_cache(['state'], job_ids)
+        return self.browse(sorted(job_ids))
+
+    @api.model
+    def _requeue_stale_jobs(self, timeout_minutes=60):
+        """Put back jobs left running by a worker that died"""
+        stale_jobs = self.search([
+            ('state', '=', 'running'),
+            ('write_date', '<', fields.Datetime.now() - timedelta(minutes=timeout_minutes)),
+        ])
+        for job in stale_jobs:
+            job._schedule_retry(_('Job was interrupted'))
+
+    @api.model
+    def _cron_process_jobs(self, batch_size=50, time_budget=CRON_TIME_BUDGET_SECONDS):
+        """Cron job draining the sync queue batch by batch
+
+        Batches are claimed until the queue is empty or time_budget seconds
+        have passed; jobs claimed but not started by then are released.
+        Returns the number of jobs run.
+        """
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        deadline = time.monotonic() + time_budget
+        self._requeue_stale_jobs()
+
+        job_count = 0
+        while time.monotonic() < deadline:
+            jobs = self._claim_jobs(batch_size)
+            if auto_commit:
+                self.env.cr.commit()
+            if not jobs:
+                break
+
+            runs = set()
+            for index, job in enumerate(jobs):
+                if time.monotonic() >= deadline:
+                    jobs[index:].write({'state': 'pending'})
+                    break
+                job._run()
+                job_count += 1
+                runs.add((job.service_id, job.run_start))
+                if auto_commit:
+                    self.env.cr.commit()
+
+            for service, run_start in runs:
+                service._finalize_sync_run(run_start)
+            if auto_commit:
+                self.env.cr.commit()
+        return job_count
@@ -1,17 +1,47 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.tools import html_escape
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+import hashlib
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import pytz
 
 _logger = logging.getLogger(__name__)
 
+# Keep-alive HTTP sessions shared across sync runs, keyed by endpoint/credentials
+_api_sessions = {}
+_api_sessions_lock = threading.Lock()
+
+
+def _payload_digest(data):
+    """Stable digest of a normalized API payload, used to skip no-op writes"""
+    payload = json.dumps(data, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _fetch_articles_worker(session, api_url, tender_id):
+    """Fetch the articles of one tender; runs in a worker thread, no ORM access"""
+    try:
+        response = session.get(f"{api_url}/tenders/{tender_id}/articles", timeout=30)
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.RequestException as e:
+        _logger.error(f"Failed to fetch articles for tender {tender_id}: {str(e)}")
+        return None
+
+
 class GovconSyncService(models.Model):
     _name = 'govcon.sync.service'
     _description = 'Government Contract Sync Service'
 
+    # Pagination state kept in the page parameters but never sent to the API
+    _page_state_keys = ['fetched_count', 'page_fingerprint']
+
     name = fields.Char('Service Name', required=True)
     api_url = fields.Char('API URL', required=True)
     api_key = fields.Char('API Key', required=True)
@@ -19,6 +49,16 @@ class GovconSyncService(models.Model):
     
     # Sync Configuration
     sync_interval_hours = fields.Integer('Sync Interval (Hours)', default=24)
+    page_size = fields.Integer('Page Size', default=100, help="Number of tenders requested per API page")
+    fetch_concurrency = fields.Integer('Fetch Concurrency', default=8, help="Number of article requests sent to the API in parallel")
+    sync_mode = fields.Selection([
+        ('full', 'Full'),
+        ('incremental', 'Incremental')
+    ], string='Sync Mode', default='incremental', help="Incremental syncs only request tenders modified since the watermark")
+    commit_chunk_size = fields.Integer('Commit Chunk Size', default=500, help="Number of tenders processed between two commits")
+    sync_checkpoint = fields.Text('Sync Checkpoint', readonly=True, copy=False, help="Next API page of an interrupted sync, used to resume it")
+    merge_email_duplicates = fields.Boolean('Merge Email Duplicates', default=False, help="Merge email tenders matching a newly synced tender instead of only flagging them")
+    sync_watermark = fields.Datetime('Sync Watermark', readonly=True, help="Start time of the last fully successful sync, sent as modified_since")
     last_sync_date = fields.Datetime('Last Sync Date', readonly=True)
     next_sync_date = fields.Datetime('Next Sync Date', compute='_compute_next_sync_date', store=True)
     
@@ -42,26 +82,59 @@ class GovconSyncService(models.Model):
             else:
                 service.next_sync_date = fields.Datetime.now()
 
-    def sync_tenders_from_api(self):
-        """Sync tenders from ibiDs API"""
+    def sync_tenders_from_api(self, full=False):
+        """Sync tenders from ibiDs API
+
+        In incremental mode only tenders modified since the watermark are
+        requested. A full run also forgets the stored payload digests, so
+        every tender has its articles fetched and merged again. The watermark is written in the same transaction as the
+        synced tenders, so it only advances when that work is committed.
+
+        Outside of tests the work is committed every commit_chunk_size
+        tenders together with a checkpoint of the next page to request, so
+        an interrupted run resumes from there instead of starting over.
+        """
         self.ensure_one()
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
         
         try:
-            # Fetch tender data from API
-            tender_data = self._fetch_tender_data()
+            checkpoint = json.loads(self.sync_checkpoint) if self.sync_checkpoint and not full else {}
+            if checkpoint:
+                _logger.info(f"Resuming sync for service {self.name} from checkpoint {checkpoint['params']}")
+                sync_start = fields.Datetime.to_datetime(checkpoint['sync_start'])
+                params = checkpoint['params']
+                synced_count = checkpoint['synced_count']
+                total_count = checkpoint['total_count']
+            else:
+                sync_start = fields.Datetime.now()
+                modified_since = False
+                if full:
+                    self._reset_payload_hashes()
+                elif self.sync_mode == 'incremental':
+                    modified_since = self.sync_watermark
+                params = self._get_initial_page_params(modified_since)
+                synced_count = 0
+                total_count = 0
             
-            # Process each tender
-            synced_count = 0
-            for tender_info in tender_data:
-                try:
-                    self._process_tender_data(tender_info)
-                    synced_count += 1
-                except Exception as e:
-                    _logger.error(f"Error processing tender {tender_info.get('tender_id')}: {str(e)}")
-                    continue
+            # Process tenders as the API pages arrive, committing chunk by chunk
+            chunk_size = self.commit_chunk_size or 500
+            uncommitted_count = 0
+            for page, next_params in self._fetch_tender_pages(params):
+                total_count += len(page)
+                synced_count += self._process_tender_page(page)
+                uncommitted_count += len(page)
+                if auto_commit and next_params and uncommitted_count >= chunk_size:
+                    self._save_sync_checkpoint(next_params, sync_start, synced_count, total_count)
+                    self.env.cr.commit()
+                    uncommitted_count = 0
             
-            # Update sync statistics
-            self._update_sync_stats(synced_count, len(tender_data))
+            # Update sync statistics, failed tenders are retried by the next run
+            self.sync_checkpoint = False
+            if synced_count == total_count:
+                self._update_sync_stats(synced_count, total_count)
+                self.sync_watermark = sync_start
+            else:
+                self._update_sync_stats(synced_count, total_count, 'partial')
             
             return {
                 'type': 'ir.actions.client',
@@ -75,28 +148,126 @@ class GovconSyncService(models.Model):
             
         except Exception as e:
             _logger.error(f"Sync error: {str(e)}")
+            if auto_commit:
+                # Drop the failed chunk, including its pending ORM writes and
+                # recomputations, but keep the last committed checkpoint
+                self.env.cr.rollback()
+                self.env.clear()
             self._update_sync_stats(0, 0, 'error', str(e))
+            if auto_commit:
+                self.env.cr.commit()
             raise ValidationError(_('Sync failed: %s') % str(e))
 
-    def _fetch_tender_data(self):
-        """Fetch tender data from ibiDs API"""
-        headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json'
-        }
+    def _save_sync_checkpoint(self, params, sync_start, synced_count, total_count):
+        """Persist where an interrupted sync should resume"""
+        self.sync_checkpoint = json.dumps({
+            'params': params,
+            'sync_start': fields.Datetime.to_string(sync_start),
+            'synced_count': synced_count,
+            'total_count': total_count,
+        })
+
+    def _get_initial_page_params(self, modified_since=False):
+        """Query parameters for the first page of /tenders"""
+        params = {'page': 1, 'page_size': self.page_size or 100}
+        if modified_since:
+            params['modified_since'] = fields.Datetime.to_string(modified_since)
+        return params
+
+    def _fetch_tender_pages(self, params=None):
+        """Yield (tenders, next_params) pages from ibiDs API until the last page
+
+        next_params are the query parameters of the following page, or None
+        on the last one, and can be stored to resume the iteration later.
+        """
+        params = params or self._get_initial_page_params()
         
+        while params:
+            tenders, next_params = self._fetch_tender_page(params)
+            if tenders:
+                yield tenders, next_params
+            params = next_params
+
+    def _fetch_tender_page(self, params):
+        """Fetch a single page of /tenders, returns (tenders, next_params)
+
+        A next page is only requested when the API announces one, through a
+        cursor, a has_more/next field or a total count. A page repeating the
+        ids of the previous one means the API ignores the page parameters.
+        """
+        session = self._get_api_session()
+        request_params = {key: value for key, value in params.items() if key not in self._page_state_keys}
         try:
-            response = requests.get(f"{self.api_url}/tenders", headers=headers, timeout=30)
+            response = session.get(f"{self.api_url}/tenders", params=request_params, timeout=30)
             response.raise_for_status()
-            return response.json()
+            tenders, next_cursor, has_more = self._parse_tender_page(response.json(), params)
         except requests.exceptions.RequestException as e:
-            _logger.error(f"API request failed: {str(e)}")
+            _logger.error(f"API request failed on page {params.get('page') or params.get('cursor')}: {str(e)}")
             raise ValidationError(_('Failed to fetch data from API: %s') % str(e))
+        
+        page_fingerprint = _payload_digest(sorted(str(tender_info.get('tender_id')) for tender_info in tenders))
+        if tenders and page_fingerprint == params.get('page_fingerprint'):
+            _logger.error(f"API returned the same tenders again on page {params.get('page') or params.get('cursor')}")
+            raise ValidationError(_('The API returned the same page twice, it does not seem to support pagination'))
+        
+        # Cursor pagination when the API provides one, page numbers otherwise
+        if not tenders:
+            next_params = None
+        elif next_cursor:
+            next_params = dict(params, cursor=next_cursor)
+            next_params.pop('page', None)
+        elif 'page' in params and has_more:
+            next_params = dict(params, page=params['page'] + 1)
+        else:
+            next_params = None
+        if next_params:
+            next_params.update({
+                'fetched_count': params.get('fetched_count', 0) + len(tenders),
+                'page_fingerprint': page_fingerprint,
+            })
+        return tenders, next_params
+
+    def _get_api_session(self):
+        """Return a pooled keep-alive HTTP session for this service's API"""
+        pool_size = max(self.fetch_concurrency, 1)
+        key = (self.api_url, self.api_key, pool_size)
+        with _api_sessions_lock:
+            session = _api_sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                session.headers.update({
+                    'Authorization': f'Bearer {self.api_key}',
+                    'Content-Type': 'application/json'
+                })
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _api_sessions[key] = session
+        return session
+
+    def _parse_tender_page(self, payload, params):
+        """Split an API page payload into (tenders, next_cursor, has_more)
+
+        A bare list is a single unpaginated page. has_more comes from the
+        has_more or next field, or from the total count compared with the
+        tenders fetched so far; without any of them there is no next page.
+        """
+        if isinstance(payload, list):
+            return payload, None, False
+        tenders = payload.get('results') or payload.get('data') or []
+        next_cursor = payload.get('next_cursor')
+        if 'has_more' in payload:
+            has_more = bool(payload['has_more'])
+        elif 'next' in payload:
+            has_more = bool(payload['next'])
+        else:
+            total = payload.get('total', payload.get('count'))
+            has_more = isinstance(total, int) and params.get('fetched_count', 0) + len(tenders) < total
+        return tenders, next_cursor, has_more
 
-    def _process_tender_data(self, tender_info):
-        """Process individual tender data from API"""
-        # Map API fields to model fields
-        tender_vals = {
+    def _prepare_tender_vals(self, tender_info):
+        """Map API fields to govcon.tender fields"""
+        return {
             'tender_id': tender_info.get('tender_id'),
             'procuring_entity': tender_info.get('procuring_entity'),
             'tender_value': tender_info.get('tender_value'),
@@ -122,76 +293,417 @@ class GovconSyncService(models.Model):
             'tender_generator_link_other': tender_info.get('tender_generator_link_other'),
             'f33_tender_link': tender_info.get('f33_tender_link'),
         }
+
+    def _process_tender_page(self, tender_page, failed_tenders=None):
+        """Upsert a page of tenders in bulk and sync their articles
+
+        Returns the number of tenders synced. If the bulk upsert fails the
+        page is replayed tender by tender so one bad record does not drop
+        the whole page. Payload digests are only stored for tenders whose
+        articles were merged, so the others are processed again by the next
+        run. Tenders that could not be processed are appended to
+        failed_tenders when a list is given.
+        """
+        try:
+            with self.env.cr.savepoint():
+                tenders, unchanged_tender_ids, payload_hashes = self._upsert_tenders(tender_page)
+        except Exception as e:
+            _logger.warning(f"Bulk upsert failed, processing page per tender: {str(e)}")
+            return self._process_tender_page_per_record(tender_page, failed_tenders=failed_tenders)
+        
+        # Articles are downloaded concurrently, the ORM writes stay on this cursor
+        changed_tender_ids = [tender_id for tender_id in tenders if tender_id not in unchanged_tender_ids]
+        articles_by_tender = self._fetch_articles_for_tenders(changed_tender_ids)
+        
+        synced_count = len(unchanged_tender_ids)
+        line_ids = []
+        created_line_ids = []
+        synced_hashes = {}
+        for tender_info in tender_page:
+            tender = tenders.get(tender_info.get('tender_id'))
+            if not tender or tender.tender_id in unchanged_tender_ids:
+                continue
+            try:
+                tender_created_line_ids = []
+                with self.env.cr.savepoint():
+                    line_ids += self._sync_tender_articles(
+                        tender, tender_info.get('tender_id'),
+                        articles_data=articles_by_tender.get(tender.tender_id),
+                        created_line_ids=tender_created_line_ids,
+                    )
+                created_line_ids += tender_created_line_ids
+                synced_hashes[tender.id] = payload_hashes[tender.tender_id]
+                synced_count += 1
+            except Exception as e:
+                _logger.error(f"Error processing tender {tender_info.get('tender_id')}: {str(e)}")
+                if failed_tenders is not None:
+                    failed_tenders.append(tender_info)
+        
+        self._store_payload_hashes(synced_hashes)
+        # Prices of the new lines of the page go into the UNSPSC statistics at once
+        Line = self.env['govcon.tender.line']
+        self.env['govcon.unspsc.price.stats']._add_line_prices(Line.browse(created_line_ids))
+        # Pricing analytics of every changed line of the page in one pass
+        Line._recompute_pricing_analytics(line_ids)
+        return synced_count
+
+    def _process_tender_page_per_record(self, tender_page, failed_tenders=None):
+        """Fallback processing of a page one tender at a time"""
+        synced_count = 0
+        for tender_info in tender_page:
+            try:
+                with self.env.cr.savepoint():
+                    self._process_tender_data(tender_info)
+                synced_count += 1
+            except Exception as e:
+                _logger.error(f"Error processing tender {tender_info.get('tender_id')}: {str(e)}")
+                if failed_tenders is not None:
+                    failed_tenders.append(tender_info)
+        return synced_count
+
+    def _upsert_tenders(self, tender_page):
+        """Create or update a page of tenders keyed by tender_id
+
+        Existing tenders are resolved with a single query, new ones are
+        created with one create(vals_list). Only the fields that differ from
+        the stored tender are written, tenders sharing the same changes in
+        one write. Tenders whose payload digest matches the stored one are
+        not written at all. Writes run in the bulk import context, changed
+        tenders get one summary message instead.
+
+        Returns a dict tender_id -> record, the set of unchanged tender_ids
+        and a dict tender_id -> payload digest of the other tenders, which
+        the caller stores with _store_payload_hashes once their articles
+        are merged.
+        """
+        Tender = self.env['govcon.tender'].with_context(**self._get_bulk_import_context())
+        
+        # Last occurrence wins when the API repeats a tender within a page
+        vals_by_tender_id = {}
+        payload_hashes = {}
+        timelines = {}
+        for tender_info in tender_page:
+            tender_vals = self._prepare_tender_vals(tender_info)
+            if tender_vals['tender_id']:
+                payload_hashes[tender_vals['tender_id']] = _payload_digest(tender_vals)
+                timelines[tender_vals['tender_id']] = self._split_tender_timeline(tender_vals)
+                vals_by_tender_id[tender_vals['tender_id']] = tender_vals
+        if not vals_by_tender_id:
+            return {}, set(), {}
+        
+        existing = Tender.search([('tender_id', 'in', list(vals_by_tender_id))])
+        tenders = {tender.tender_id: tender for tender in existing}
+        
+        # Group updates by their changed fields so each group is one write
+        update_groups = {}
+        create_vals_list = []
+        unchanged_tender_ids = set()
+        summaries = {}
+        for tender_id, tender_vals in vals_by_tender_id.items():
+            if tender_id in tenders:
+                tender = tenders[tender_id]
+                if tender.api_payload_hash == payload_hashes[tender_id]:
+                    unchanged_tender_ids.add(tender_id)
+                    continue
+                changes = self._get_record_changes(tender, {
+                    field_name: value for field_name, value in tender_vals.items() if field_name != 'tender_id'
+                })
+                if not changes:
+                    continue
+                summaries[tender] = self._get_tender_summary_changes(tender, changes)
+                key = json.dumps(changes, sort_keys=True, default=str)
+                update_groups.setdefault(key, (changes, []))[1].append(tender.id)
+            else:
+                create_vals_list.append(self._classify_tender_vals(tender_vals))
+        
+        for changes, tender_ids in update_groups.values():
+            Tender.browse(tender_ids).write(changes)
+        self._post_sync_summaries(summaries)
+        
+        if create_vals_list:
+            created_tenders = Tender.create(create_vals_list)
+            for tender in created_tenders:
+                tenders[tender.tender_id] = tender
+            self._handle_email_duplicates(created_tenders)
+        
+        self.env['govcon.tender.date']._sync_tender_timelines({
+            tender: timelines[tender_id]
+            for tender_id, tender in tenders.items() if tender_id not in unchanged_tender_ids
+        })
+        
+        return tenders, unchanged_tender_ids, {
+            tender_id: payload_hash for tender_id, payload_hash in payload_hashes.items()
+            if tender_id not in unchanged_tender_ids
+        }
+
+    def _reset_payload_hashes(self):
+        """Forget every stored payload digest so the next sync merges all articles again"""
+        Tender = self.env['govcon.tender']
+        Tender.flush(['api_payload_hash'])
+        self.env.cr.execute("UPDATE govcon_tender SET api_payload_hash = NULL WHERE api_payload_hash IS NOT NULL")
+        Tender.invalidate_cache(['api_payload_hash'])
+
+    def _store_payload_hashes(self, payload_hashes):
+        """Store {tender record id: payload digest} with a single UPDATE"""
+        if not payload_hashes:
+            return
+        Tender = self.env['govcon.tender']
+        Tender.flush(['api_payload_hash'])
+        values = ', '.join(['(%s, %s)'] * len(payload_hashes))
+        params = [item for tender_id, payload_hash in payload_hashes.items() for item in (tender_id, payload_hash)]
+        self.env.cr.execute(f"""
+            UPDATE govcon_tender AS tender
+               SET api_payload_hash = data.payload_hash
+              FROM (VALUES {values}) AS data(id, payload_hash)
+             WHERE tender.id = data.id
+        """, params)
+        Tender.invalidate_cache(['api_payload_hash'], list(payload_hashes))
+
+    def _split_tender_timeline(self, tender_vals):
+        """Parse the API timeline out of tender_vals
+
+        The API may send all_tender_dates as a single date or as the full
+        timeline, either {name: date} or [{name, date}]. A full timeline is
+        returned as {api_field_name: datetime} and all_tender_dates is set
+        to its earliest date.
+        """
+        raw_dates = tender_vals.get('all_tender_dates')
+        if isinstance(raw_dates, dict):
+            items = raw_dates.items()
+        elif isinstance(raw_dates, list):
+            items = [
+                (item.get('field') or item.get('name'), item.get('date') or item.get('value'))
+                for item in raw_dates if isinstance(item, dict)
+            ]
+        else:
+            return {}
+        
+        timeline = {}
+        for api_field_name, raw_value in items:
+            if not api_field_name or not raw_value:
+                continue
+            try:
+                timeline[api_field_name] = fields.Datetime.to_datetime(str(raw_value).replace('T', ' ')[:19])
+            except ValueError:
+                _logger.warning(f"Ignoring unparsable date {raw_value!r} for {api_field_name}")
+        tender_vals['all_tender_dates'] = min(timeline.values()) if timeline else False
+        return timeline
+
+    def _classify_tender_vals(self, tender_vals):
+        """Set the tender type of a new tender from its procurement method and description"""
+        tender_type = self.env['govcon.tender.type']._classify_text(' '.join([
+            tender_vals.get('procurement_method') or '',
+            tender_vals.get('description') or '',
+        ]))
+        if tender_type:
+            tender_vals = dict(tender_vals, tender_type_id=tender_type.id)
+        return tender_vals
+    
+    def _handle_email_duplicates(self, tenders):
+        """Flag, or merge when configured, email tenders announcing newly synced tenders"""
+        email_tenders = tenders._flag_email_duplicates()
+        if email_tenders and self.merge_email_duplicates:
+            email_tenders.action_merge_duplicate()
+    
+    def _get_bulk_import_context(self):
+        """Context disabling per-field mail tracking and creation logs for sync writes"""
+        return {
+            'tracking_disable': True,
+            'mail_notrack': True,
+            'mail_create_nolog': True,
+        }
+
+    def _get_tender_summary_changes(self, tender, vals):
+        """Return [(label, old, new)] for the meaningful fields vals would change"""
+        changes = self._get_record_changes(tender, {
+            field_name: value for field_name, value in vals.items()
+            if field_name in tender._sync_summary_fields
+        })
+        return [
+            (tender._fields[field_name].string, tender[field_name], changes[field_name])
+            for field_name in tender._sync_summary_fields if field_name in changes
+        ]
+
+    def _post_sync_summaries(self, summaries):
+        """Log one aggregated chatter note per tender with meaningful changes, in a single batch"""
+        bodies = {}
+        for tender, changes in summaries.items():
+            if not changes:
+                continue
+            items = ''.join(
+                f"<li>{html_escape(label)}: {html_escape(old or '')} &#8594; {html_escape(new or '')}</li>"
+                for label, old, new in changes
+            )
+            bodies[tender.id] = _('Updated by ibiDs sync (%s):') % html_escape(self.name) + f"<ul>{items}</ul>"
+        if bodies:
+            self.env['govcon.tender'].browse(list(bodies))._message_log_batch(
+                bodies, subtype_id=self.env['ir.model.data'].xmlid_to_res_id('mail.mt_note'),
+            )
+
+    def _process_tender_data(self, tender_info, force=False):
+        """Process individual tender data from API
+
+        The payload digest is only stored once the articles are merged, so a
+        tender whose articles failed is processed again by the next run.
+        With force the tender and its articles are synced even when the
+        payload digest is unchanged.
+        """
+        tender_vals = self._prepare_tender_vals(tender_info)
+        payload_hash = _payload_digest(tender_vals)
+        timeline = self._split_tender_timeline(tender_vals)
         
         # Find existing tender or create new one
-        existing_tender = self.env['govcon.tender'].search([
+        Tender = self.env['govcon.tender'].with_context(**self._get_bulk_import_context())
+        existing_tender = Tender.search([
             ('tender_id', '=', tender_vals['tender_id'])
         ], limit=1)
         
-        if existing_tender:
+        if existing_tender and not force and existing_tender.api_payload_hash == payload_hash:
+            # Nothing changed since the last sync
+            return existing_tender
+        elif existing_tender:
             # Update existing tender
+            summary = self._get_tender_summary_changes(existing_tender, tender_vals)
             existing_tender.write(tender_vals)
+            self._post_sync_summaries({existing_tender: summary})
             tender = existing_tender
         else:
             # Create new tender
-            tender = self.env['govcon.tender'].create(tender_vals)
+            tender = Tender.create(self._classify_tender_vals(tender_vals))
+            self._handle_email_duplicates(tender)
+        self.env['govcon.tender.date']._sync_tender_timelines({tender: timeline})
         
         # Sync tender articles/line items
-        self._sync_tender_articles(tender, tender_info.get('tender_id'))
+        created_line_ids = []
+        line_ids = self._sync_tender_articles(tender, tender_info.get('tender_id'), created_line_ids=created_line_ids)
+        self._store_payload_hashes({tender.id: payload_hash})
+        Line = self.env['govcon.tender.line']
+        self.env['govcon.unspsc.price.stats']._add_line_prices(Line.browse(created_line_ids))
+        Line._recompute_pricing_analytics(line_ids)
         
         return tender
 
-    def _sync_tender_articles(self, tender, tender_id):
-        """Sync tender articles/line items from API"""
+    def _sync_tender_articles(self, tender, tender_id, articles_data=None, created_line_ids=None):
+        """Sync tender articles/line items from API, returning the changed line ids
+
+        Raises when the articles cannot be fetched, the current lines are kept.
+        """
         try:
-            # Fetch articles for this tender
-            articles_data = self._fetch_tender_articles(tender_id)
-            
-            # Clear existing lines
-            tender.line_ids.unlink()
-            
-            # Create new lines
-            for article_info in articles_data:
-                line_vals = {
-                    'tender_id': tender.id,
-                    'article_number': article_info.get('article_number'),
-                    'article_description': article_info.get('article_description'),
-                    'lot_info': article_info.get('lot_info'),
-                    'unit': article_info.get('unit'),
-                    'quantity': article_info.get('quantity'),
-                    'unit_price': article_info.get('unit_price'),
-                    'unspsc_code': article_info.get('unspsc_code'),
-                    'unspsc_description': article_info.get('unspsc_description'),
-                    'ibids_estimated_price': article_info.get('ibids_estimated_price'),
-                    'avahi_price_25_quartile': article_info.get('avahi_price_25_quartile'),
-                    'avahi_price_75_quartile': article_info.get('avahi_price_75_quartile'),
-                    'competitiveness_rank': article_info.get('competitiveness_rank'),
-                }
-                
-                self.env['govcon.tender.line'].create(line_vals)
+            # Fetch articles for this tender unless they were prefetched
+            if articles_data is None:
+                articles_data = self._fetch_tender_articles(tender_id)
+            if articles_data is None:
+                raise ValidationError(_('Could not fetch the articles of tender %s') % tender_id)
+            return self._merge_tender_articles(tender, articles_data, created_line_ids=created_line_ids)
                 
         except Exception as e:
             _logger.error(f"Error syncing articles for tender {tender_id}: {str(e)}")
             raise
 
-    def _fetch_tender_articles(self, tender_id):
-        """Fetch tender articles from ibiDs API"""
-        headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json'
+    def _prepare_line_vals(self, article_info):
+        """Map API article fields to govcon.tender.line fields"""
+        return {
+            'article_number': article_info.get('article_number'),
+            'article_description': article_info.get('article_description'),
+            'lot_info': article_info.get('lot_info'),
+            'unit': article_info.get('unit'),
+            'quantity': article_info.get('quantity'),
+            'unit_price': article_info.get('unit_price'),
+            'unspsc_code': article_info.get('unspsc_code'),
+            'unspsc_description': article_info.get('unspsc_description'),
+            'ibids_estimated_price': article_info.get('ibids_estimated_price'),
+            'avahi_price_25_quartile': article_info.get('avahi_price_25_quartile'),
+            'avahi_price_75_quartile': article_info.get('avahi_price_75_quartile'),
+            'competitiveness_rank': article_info.get('competitiveness_rank'),
         }
+
+    def _merge_tender_articles(self, tender, articles_data, created_line_ids=None):
+        """Merge API articles into the tender lines keyed on article number and lot
+
+        Only new articles are created, only changed fields are written and
+        only vanished articles are deleted, each in a single batch, so an
+        unchanged tender causes no writes at all. Returns the ids of the
+        created and updated lines, whose pricing analytics the caller must
+        recompute with govcon.tender.line._recompute_pricing_analytics. The
+        ids of the created lines are appended to created_line_ids when a list
+        is given, for the caller to add their prices to the UNSPSC statistics.
+        """
+        Line = self.env['govcon.tender.line']
         
-        try:
-            response = requests.get(
-                f"{self.api_url}/tenders/{tender_id}/articles", 
-                headers=headers, 
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            _logger.error(f"Failed to fetch articles for tender {tender_id}: {str(e)}")
+        line_vals_list = [self._prepare_line_vals(article_info) for article_info in articles_data]
+        articles_hash = _payload_digest(line_vals_list)
+        if tender.api_articles_hash == articles_hash:
             return []
+        # Fill the quartiles and rank ibiDs omitted from the local price history
+        self.env['govcon.unspsc.price.stats']._fill_missing_line_stats(line_vals_list)
+        
+        existing_lines = {}
+        for line in tender.line_ids:
+            existing_lines.setdefault(self._get_article_key(line.article_number, line.lot_info), []).append(line)
+        
+        create_vals_list = []
+        update_groups = {}
+        for line_vals in line_vals_list:
+            key = self._get_article_key(line_vals['article_number'], line_vals['lot_info'])
+            matches = existing_lines.get(key)
+            if matches:
+                line = matches.pop(0)
+                changes = self._get_record_changes(line, line_vals)
+                if changes:
+                    group_key = json.dumps(changes, sort_keys=True, default=str)
+                    update_groups.setdefault(group_key, (changes, []))[1].append(line.id)
+            else:
+                create_vals_list.append(dict(line_vals, tender_id=tender.id))
+        
+        vanished_lines = Line.browse([line.id for lines in existing_lines.values() for line in lines])
+        if vanished_lines:
+            vanished_lines.unlink()
+        changed_lines = Line.browse()
+        for changes, line_ids in update_groups.values():
+            Line.browse(line_ids).write(changes)
+            changed_lines |= Line.browse(line_ids)
+        if create_vals_list:
+            created_lines = Line.create(create_vals_list)
+            changed_lines |= created_lines
+            if created_line_ids is not None:
+                created_line_ids += created_lines.ids
+        tender.api_articles_hash = articles_hash
+        
+        # Pricing analytics are recomputed in bulk by the caller
+        changed_lines._defer_pricing_analytics()
+        return changed_lines.ids
+
+    def _get_article_key(self, article_number, lot_info):
+        """Merge key of an article, the same for raw API values and stored Char values"""
+        return (str(article_number or '').strip(), str(lot_info or '').strip())
+
+    def _get_record_changes(self, record, vals):
+        """Return the subset of vals that differs from the stored record"""
+        changes = {}
+        for field_name, value in vals.items():
+            field = record._fields[field_name]
+            normalized = field.convert_to_record(field.convert_to_cache(value, record), record)
+            if record[field_name] != normalized:
+                changes[field_name] = value
+        return changes
+
+    def _fetch_tender_articles(self, tender_id):
+        """Fetch tender articles from ibiDs API, None if the request failed"""
+        return _fetch_articles_worker(self._get_api_session(), self.api_url, tender_id)
+
+    def _fetch_articles_for_tenders(self, tender_ids):
+        """Fetch the articles of several tenders over a bounded thread pool
+
+        Returns a dict tender_id -> articles (None when the request failed).
+        """
+        if not tender_ids:
+            return {}
+        session = self._get_api_session()
+        api_url = self.api_url
+        max_workers = min(max(self.fetch_concurrency, 1), len(tender_ids))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda tender_id: _fetch_articles_worker(session, api_url, tender_id), tender_ids)
+            return dict(zip(tender_ids, results))
 
     def _update_sync_stats(self, synced_count, total_count, status='success', message=''):
         """Update sync statistics"""
@@ -237,18 +749,129 @@ class GovconSyncService(models.Model):
             }
 
     def action_manual_sync(self):
-        """Manual sync action"""
-        return self.sync_tenders_from_api()
+        """Manual sync action, queued so the web worker is not blocked"""
+        self.ensure_one()
+        self._enqueue_sync()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Sync Queued'),
+                'message': _('The tender sync has been queued and will run in the background'),
+                'type': 'info',
+            }
+        }
+
+    def action_full_sync(self):
+        """Manual full sync action, ignoring the watermark"""
+        self.ensure_one()
+        self._enqueue_sync(full=True)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Sync Queued'),
+                'message': _('A full tender sync has been queued and will run in the background'),
+                'type': 'info',
+            }
+        }
+
+    def _enqueue_sync(self, full=False):
+        """Queue the first page job of a sync run
+
+        An interrupted synchronous run is resumed from its checkpoint. A full
+        run forgets the stored payload digests so every tender has its
+        articles merged again. Nothing is queued while a run of this service
+        is still in progress.
+        """
+        self.ensure_one()
+        Job = self.env['govcon.sync.job']
+        active_job = Job.search([
+            ('service_id', '=', self.id),
+            ('state', 'in', ('pending', 'running')),
+        ], limit=1)
+        if active_job:
+            return active_job
+        
+        checkpoint = json.loads(self.sync_checkpoint) if self.sync_checkpoint and not full else {}
+        if checkpoint:
+            run_start = fields.Datetime.to_datetime(checkpoint['sync_start'])
+            params = checkpoint['params']
+        else:
+            run_start = fields.Datetime.now()
+            modified_since = False
+            if full:
+                self._reset_payload_hashes()
+            elif self.sync_mode == 'incremental':
+                modified_since = self.sync_watermark
+            params = self._get_initial_page_params(modified_since)
+        self.sync_checkpoint = False
+        
+        return Job.create({
+            'service_id': self.id,
+            'job_type': 'page',
+            'run_start': run_start,
+            'payload': json.dumps(params),
+        })
+
+    def _run_page_job(self, job):
+        """Fetch and process one API page, queueing the next page first"""
+        tenders, next_params = self._fetch_tender_page(json.loads(job.payload))
+        Job = self.env['govcon.sync.job']
+        if next_params:
+            Job.create({
+                'service_id': self.id,
+                'job_type': 'page',
+                'run_start': job.run_start,
+                'payload': json.dumps(next_params),
+            })
+        
+        # Failed tenders get their own job so they are retried independently
+        failed_tenders = []
+        synced_count = self._process_tender_page(tenders, failed_tenders=failed_tenders)
+        Job.create([{
+            'service_id': self.id,
+            'job_type': 'tender',
+            'run_start': job.run_start,
+            'tender_ref': tender_info.get('tender_id'),
+            'payload': json.dumps(tender_info, default=str),
+        } for tender_info in failed_tenders])
+        job.write({'tender_count': len(tenders), 'synced_count': synced_count})
+
+    def _run_tender_job(self, job):
+        """Process a single tender that failed within its page"""
+        self._process_tender_data(json.loads(job.payload), force=True)
+        job.synced_count = 1
+
+    def _finalize_sync_run(self, run_start):
+        """Update statistics and the watermark once every job of a run is finished"""
+        self.ensure_one()
+        Job = self.env['govcon.sync.job']
+        run_domain = [('service_id', '=', self.id), ('run_start', '=', run_start)]
+        if Job.search_count(run_domain + [('state', 'in', ('pending', 'running'))]):
+            return False
+        
+        jobs = Job.search(run_domain)
+        page_jobs = jobs.filtered(lambda job: job.job_type == 'page')
+        total_count = sum(page_jobs.mapped('tender_count'))
+        synced_count = sum(jobs.filtered(lambda job: job.state == 'done').mapped('synced_count'))
+        if jobs.filtered(lambda job: job.state == 'failed'):
+            self._update_sync_stats(synced_count, total_count, 'partial')
+        else:
+            self._update_sync_stats(synced_count, total_count)
+            self.sync_watermark = run_start
+        return True
 
     @api.model
     def _cron_sync_tenders(self):
-        """Cron job for automatic tender sync"""
+        """Cron job for automatic tender sync, queues one run per due service"""
         active_services = self.search([('is_active', '=', True)])
         
         for service in active_services:
-            if service.next_sync_date <= fields.Datetime.now():
+            # Interrupted runs are resumed right away
+            if service.sync_checkpoint or service.next_sync_date <= fields.Datetime.now():
                 try:
-                    service.sync_tenders_from_api()
+                    service._enqueue_sync()
                 except Exception as e:
                     _logger.error(f"Automatic sync failed for service {service.name}: {str(e)}")
-                    service._update_sync_stats(0, 0, 'error', str(e)) 
\ No newline at end of file
+                    service._update_sync_stats(0, 0, 'error', str(e))
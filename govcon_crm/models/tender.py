@@ -1,15 +1,73 @@
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import ValidationError
+from .tender_dedupe import (
+    EMAIL_TENDER_PREFIX, DUPLICATE_SIMILARITY, dedupe_text, minhash_signature, minhash_similarity, values_match,
+)
 import logging
+import psycopg2
 
 _logger = logging.getLogger(__name__)
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Number of tender lines recomputed per query by the bulk pricing analytics
+PRICING_ANALYTICS_CHUNK_SIZE = 10000
+
+
+def compute_pricing_analytics(unit_prices, quantities, estimated_prices, ranks):
+    """Return (total_prices, price_variances, competitiveness) for columns of line values
+
+    Same results as the line compute methods, vectorized with NumPy when it
+    is installed.
+    """
+    if np is None:
+        total_prices = [unit_price * quantity for unit_price, quantity in zip(unit_prices, quantities)]
+        price_variances = [
+            ((unit_price - estimated_price) / estimated_price) * 100 if estimated_price and unit_price else 0.0
+            for unit_price, estimated_price in zip(unit_prices, estimated_prices)
+        ]
+        competitiveness = [
+            'medium' if not rank else 'high' if rank < 0.3 else 'medium' if rank < 0.7 else 'low'
+            for rank in ranks
+        ]
+        return total_prices, price_variances, competitiveness
+    
+    unit_prices = np.asarray(unit_prices, dtype=float)
+    estimated_prices = np.asarray(estimated_prices, dtype=float)
+    ranks = np.asarray(ranks, dtype=float)
+    total_prices = unit_prices * np.asarray(quantities, dtype=float)
+    has_estimate = (estimated_prices != 0) & (unit_prices != 0)
+    price_variances = np.divide(
+        unit_prices - estimated_prices, estimated_prices,
+        out=np.zeros_like(unit_prices), where=has_estimate,
+    ) * 100
+    competitiveness = np.select(
+        [ranks == 0, ranks < 0.3, ranks < 0.7], ['medium', 'high', 'medium'], default='low',
+    )
+    return total_prices.tolist(), price_variances.tolist(), competitiveness.tolist()
+
 class GovconTender(models.Model):
     _name = 'govcon.tender'
     _description = 'Government Contract Tender'
     _inherit = ['mail.thread', 'mail.activity.mixin']
     _order = 'create_date desc'
 
+    # Fields reported in the chatter summary posted by the API sync
+    _sync_summary_fields = [
+        'procuring_entity', 'tender_value', 'description', 'all_tender_dates',
+        'budget_appropriation_value', 'procurement_method', 'tender_messages',
+    ]
+
+    # Fields the pipeline summary is keyed on, and those it aggregates
+    _pipeline_key_fields = {'stage_id', 'state', 'team_id', 'user_id', 'date_deadline'}
+    _pipeline_measure_fields = {'tender_value', 'estimated_value', 'total_line_value', 'win_probability'}
+
+    # Fields matched by name search, each with a trigram index when pg_trgm is available
+    _name_search_fields = ['tender_id', 'procuring_entity', 'description', 'procurement_method']
+
     # Basic Information (from ibiDs API)
     tender_id = fields.Char('Tender ID', required=True, tracking=True, help="Tender ID from compras")
     procuring_entity = fields.Char('Procuring Entity', tracking=True, help="Procuring entity from compras")
@@ -51,7 +109,7 @@ class GovconTender(models.Model):
     procurement_method = fields.Char('Procurement Method', tracking=True, help="Procurement method from compras")
     
     # Classification and Type
-    tender_type_id = fields.Many2one('govcon.tender.type', string='Tender Type', tracking=True)
+    tender_type_id = fields.Many2one('govcon.tender.type', string='Tender Type', tracking=True, index=True)
     stage_id = fields.Many2one('govcon.tender.stage', string='Stage', default=lambda self: self._get_default_stage(), tracking=True, group_expand='_read_group_stage_ids')
     
     # Status and State
@@ -80,12 +138,13 @@ class GovconTender(models.Model):
     user_id = fields.Many2one('res.users', string='Assigned To', default=lambda self: self.env.user, tracking=True)
     team_id = fields.Many2one('govcon.tender.team', string='Team', tracking=True)
     
-    # Dates (computed from all_tender_dates)
-    date_created = fields.Date('Date Created', compute='_compute_dates', store=True)
-    date_published = fields.Date('Date Published', compute='_compute_dates', store=True)
-    date_deadline = fields.Date('Submission Deadline', compute='_compute_dates', store=True)
-    date_evaluation = fields.Date('Evaluation Date', compute='_compute_dates', store=True)
-    date_awarded = fields.Date('Date Awarded', compute='_compute_dates', store=True)
+    # Dates (computed from the tender timeline, falling back to all_tender_dates)
+    tender_date_ids = fields.One2many('govcon.tender.date', 'tender_id', string='Timeline')
+    date_created = fields.Date('Date Created', compute='_compute_dates', store=True, index=True)
+    date_published = fields.Date('Date Published', compute='_compute_dates', store=True, index=True)
+    date_deadline = fields.Date('Submission Deadline', compute='_compute_dates', store=True, index=True)
+    date_evaluation = fields.Date('Evaluation Date', compute='_compute_dates', store=True, index=True)
+    date_awarded = fields.Date('Date Awarded', compute='_compute_dates', store=True, index=True)
     
     # Performance Metrics
     win_probability = fields.Float('Win Probability (%)', default=0.0, tracking=True)
@@ -101,6 +160,15 @@ class GovconTender(models.Model):
     document_ids = fields.One2many('govcon.tender.document', 'tender_id', string='Documents')
     activity_ids = fields.One2many('mail.activity', 'res_id', domain=[('res_model', '=', 'govcon.tender')], string='Activities')
     
+    # Sync change detection (digests of the last synced API payloads)
+    api_payload_hash = fields.Char('API Payload Hash', readonly=True, copy=False)
+    api_articles_hash = fields.Char('API Articles Hash', readonly=True, copy=False)
+    
+    # Duplicate Detection (email tenders announcing a tender later synced from the API)
+    dedupe_text = fields.Char('Duplicate Detection Text', compute='_compute_dedupe_text', store=True)
+    duplicate_of_id = fields.Many2one('govcon.tender', string='Possible Duplicate Of', index=True, readonly=True, copy=False)
+    duplicate_score = fields.Float('Duplicate Similarity', readonly=True, copy=False)
+    
     # Computed Fields
     total_line_value = fields.Float('Total Line Value', compute='_compute_total_line_value', store=True)
     line_count = fields.Integer('Line Count', compute='_compute_line_count', store=True)
@@ -111,79 +179,303 @@ class GovconTender(models.Model):
         ('tender_id_unique', 'unique(tender_id)', 'Tender ID must be unique!')
     ]
 
+    def init(self):
+        """Enable pg_trgm when permitted and create the trigram indexes
+
+        Name search and duplicate detection switch to trigram matching once
+        these indexes exist, so installing pg_trgm later takes effect on the
+        next module update.
+        """
+        cr = self.env.cr
+        try:
+            with cr.savepoint():
+                cr.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except psycopg2.Error as e:
+            _logger.warning(f"Could not enable pg_trgm, tender name search and duplicate detection use plain matching: {str(e)}")
+        cr.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cr.fetchone():
+            for column in self._name_search_fields:
+                self.env.cr.execute(f"""
+                    CREATE INDEX IF NOT EXISTS govcon_tender_{column}_trgm_index
+                        ON govcon_tender USING gin ({column} gin_trgm_ops)
+                """)
+            self.env.cr.execute("""
+                CREATE INDEX IF NOT EXISTS govcon_tender_dedupe_text_trgm_index
+                    ON govcon_tender USING gin (dedupe_text gin_trgm_ops)
+                 WHERE dedupe_text IS NOT NULL AND duplicate_of_id IS NULL
+            """)
+        # Every worker drops its cached answer of _has_pg_trgm
+        self.clear_caches()
+
+    @api.model
+    @tools.ormcache()
+    def _has_pg_trgm(self):
+        """Whether the trigram indexes exist, created by init when pg_trgm is available"""
+        self.env.cr.execute("""
+            SELECT 1 FROM pg_class WHERE relname = 'govcon_tender_dedupe_text_trgm_index' AND relkind = 'i'
+        """)
+        return bool(self.env.cr.fetchone())
+
     @api.model
     def _get_default_stage(self):
         """Get default stage for new tenders"""
         default_stage = self.env['govcon.tender.stage'].search([('is_default', '=', True)], limit=1)
         return default_stage.id if default_stage else False
 
-    @api.depends('all_tender_dates')
+    @api.depends('all_tender_dates', 'tender_date_ids.date_value', 'tender_date_ids.date_field_id.tender_date_role')
     def _compute_dates(self):
-        """Compute individual date fields from all_tender_dates"""
+        """Compute individual date fields from the timeline rows of each role
+
+        The earliest date of each role wins. Tenders without timeline rows keep using the single all_tender_dates
+        value for every date.
+        """
+        role_fields = {
+            'created': 'date_created',
+            'published': 'date_published',
+            'deadline': 'date_deadline',
+            'evaluation': 'date_evaluation',
+            'awarded': 'date_awarded',
+        }
         for tender in self:
-            if tender.all_tender_dates:
-                # Parse the all_tender_dates to extract individual dates
-                # This is a placeholder - actual implementation depends on date format
-                tender.date_created = tender.all_tender_dates.date()
-                tender.date_published = tender.all_tender_dates.date()
-                tender.date_deadline = tender.all_tender_dates.date()
-                tender.date_evaluation = tender.all_tender_dates.date()
-                tender.date_awarded = tender.all_tender_dates.date()
+            fallback = tender.all_tender_dates.date() if tender.all_tender_dates else False
+            role_dates = {}
+            for tender_date in tender.tender_date_ids:
+                role = tender_date.date_field_id.tender_date_role
+                if role and tender_date.date_value:
+                    date_value = tender_date.date_value.date()
+                    role_dates[role] = min(role_dates.get(role, date_value), date_value)
+            for role, field_name in role_fields.items():
+                if tender.tender_date_ids:
+                    tender[field_name] = role_dates.get(role, False)
+                else:
+                    tender[field_name] = fallback
+
+    @api.depends('tender_id', 'procuring_entity', 'description')
+    def _compute_dedupe_text(self):
+        """Normalized entity and description, kept for email tenders only"""
+        for tender in self:
+            if tender.tender_id and tender.tender_id.startswith(EMAIL_TENDER_PREFIX):
+                tender.dedupe_text = dedupe_text(tender.procuring_entity, tender.description) or False
             else:
-                tender.date_created = False
-                tender.date_published = False
-                tender.date_deadline = False
-                tender.date_evaluation = False
-                tender.date_awarded = False
+                tender.dedupe_text = False
+
+    def _read_grouped_by_tender(self, model_name, measure=None):
+        """Return {tender_id: count or measure} over a related model with one grouped query
+
+        Records still being edited (NewId) are left out, their counters are
+        computed from the cache by the caller.
+        """
+        tender_ids = [tender.id for tender in self if not isinstance(tender.id, models.NewId)]
+        if not tender_ids:
+            return {}
+        groups = self.env[model_name].read_group(
+            [('tender_id', 'in', tender_ids)], ['tender_id'] + ([f'{measure}:sum'] if measure else []),
+            ['tender_id'], lazy=False,
+        )
+        return {group['tender_id'][0]: group[measure] if measure else group['__count'] for group in groups}
 
     @api.depends('line_ids.total_price')
     def _compute_total_line_value(self):
         """Compute total value from tender lines"""
+        totals = self._read_grouped_by_tender('govcon.tender.line', 'total_price')
         for tender in self:
-            tender.total_line_value = sum(tender.line_ids.mapped('total_price'))
+            if isinstance(tender.id, models.NewId):
+                tender.total_line_value = sum(tender.line_ids.mapped('total_price'))
+            else:
+                tender.total_line_value = totals.get(tender.id) or 0.0
 
     @api.depends('line_ids')
     def _compute_line_count(self):
         """Compute number of tender lines"""
+        counts = self._read_grouped_by_tender('govcon.tender.line')
         for tender in self:
-            tender.line_count = len(tender.line_ids)
+            if isinstance(tender.id, models.NewId):
+                tender.line_count = len(tender.line_ids)
+            else:
+                tender.line_count = counts.get(tender.id, 0)
 
     @api.depends('document_ids')
     def _compute_document_count(self):
         """Compute number of documents"""
+        counts = self._read_grouped_by_tender('govcon.tender.document')
         for tender in self:
-            tender.document_count = len(tender.document_ids)
+            if isinstance(tender.id, models.NewId):
+                tender.document_count = len(tender.document_ids)
+            else:
+                tender.document_count = counts.get(tender.id, 0)
 
-    @api.model
-    def create(self, vals):
+    @api.model_create_multi
+    def create(self, vals_list):
         """Override create to set default values"""
-        if not vals.get('tender_id'):
-            raise ValidationError(_('Tender ID is required'))
-        return super().create(vals)
+        for vals in vals_list:
+            if not vals.get('tender_id'):
+                raise ValidationError(_('Tender ID is required'))
+        tenders = super().create(vals_list)
+        tenders._index_dedupe_bands()
+        self.env['govcon.tender.pipeline.dirty']._mark_tenders(tenders.ids)
+        return tenders
 
     def write(self, vals):
         """Override write to handle stage transitions"""
+        # Fold the state of the target stage into the same write, so moving
+        # many tenders is a single UPDATE and a single tracking pass
+        if 'stage_id' in vals:
+            vals = dict(vals, state=self._get_stage_state(vals['stage_id']))
+        
         result = super().write(vals)
         
-        # Handle stage transitions
-        if 'stage_id' in vals:
-            for tender in self:
-                tender._handle_stage_transition(vals['stage_id'])
+        if {'tender_id', 'procuring_entity', 'description'} & set(vals):
+            self._index_dedupe_bands()
         
         return result
 
-    def _handle_stage_transition(self, new_stage_id):
-        """Handle stage transition logic"""
-        new_stage = self.env['govcon.tender.stage'].browse(new_stage_id)
+    def _write(self, vals):
+        """Queue the pipeline summary keys that stored values leave and enter
+
+        Every stored update goes through _write, including recomputed fields.
+        """
+        Dirty = self.env['govcon.tender.pipeline.dirty']
+        if self._pipeline_key_fields & set(vals):
+            Dirty._mark_tenders(self.ids)
+        result = super()._write(vals)
+        if (self._pipeline_key_fields | self._pipeline_measure_fields) & set(vals):
+            Dirty._mark_tenders(self.ids)
+        return result
+
+    def unlink(self):
+        """Queue the pipeline summary keys of deleted tenders"""
+        self.flush()
+        self.env['govcon.tender.pipeline.dirty']._mark_tenders(self.ids)
+        return super().unlink()
+
+    def _index_dedupe_bands(self):
+        """Refresh the MinHash buckets of email tenders when pg_trgm is not available"""
+        email_tenders = self.filtered(lambda tender: tender.tender_id.startswith(EMAIL_TENDER_PREFIX))
+        if email_tenders and not self._has_pg_trgm():
+            self.env['govcon.tender.dedupe.band']._index_tenders(email_tenders)
+
+    def _find_email_duplicates(self):
+        """Return {tender: (email_tender, similarity)} for email tenders matching these tenders
+
+        Candidates come from one indexed query for the whole batch (pg_trgm
+        similarity, or the MinHash buckets without it) instead of comparing
+        every pair. They must also have a close enough value, and each email
+        tender goes to the tender it matches best.
+        """
+        texts = {}
+        for tender in self:
+            if not tender.tender_id.startswith(EMAIL_TENDER_PREFIX):
+                text = dedupe_text(tender.procuring_entity, tender.description)
+                if text:
+                    texts[tender.id] = text
+        if not texts:
+            return {}
+        
+        scored_pairs = []
+        if self._has_pg_trgm():
+            self.env.cr.execute("""
+                SELECT query.tender_id, candidate.id, similarity(candidate.dedupe_text, query.text)
+                  FROM unnest(%s::int[], %s::text[]) AS query(tender_id, text)
+                 CROSS JOIN LATERAL (
+                    SELECT id, dedupe_text FROM govcon_tender
+                     WHERE dedupe_text IS NOT NULL AND duplicate_of_id IS NULL
+                       AND dedupe_text %% query.text
+                 ) candidate
+            """, (list(texts), list(texts.values())))
+            scored_pairs = self.env.cr.fetchall()
+        else:
+            signatures = {tender_id: minhash_signature(text) for tender_id, text in texts.items()}
+            candidates = self.env['govcon.tender.dedupe.band']._find_candidates(signatures)
+            candidate_signatures = {
+                candidate.id: minhash_signature(candidate.dedupe_text)
+                for candidate in self.browse(set().union(*candidates.values()))
+            }
+            for tender_id, candidate_ids in candidates.items():
+                for candidate_id in candidate_ids:
+                    if candidate_signatures[candidate_id]:
+                        scored_pairs.append((tender_id, candidate_id, minhash_similarity(
+                            signatures[tender_id], candidate_signatures[candidate_id])))
+        
+        matches = {}
+        matched_ids = set()
+        for tender_id, candidate_id, score in sorted(scored_pairs, key=lambda pair: -pair[2]):
+            tender, candidate = self.browse(tender_id), self.browse(candidate_id)
+            if score < DUPLICATE_SIMILARITY or tender in matches or candidate_id in matched_ids:
+                continue
+            if values_match(tender.tender_value, candidate.tender_value):
+                matches[tender] = (candidate, score)
+                matched_ids.add(candidate_id)
+        return matches
+
+    def _flag_email_duplicates(self):
+        """Flag the email tenders duplicating these tenders and return them"""
+        email_tenders = self.browse()
+        bodies = {}
+        for tender, (email_tender, score) in self._find_email_duplicates().items():
+            email_tender.write({'duplicate_of_id': tender.id, 'duplicate_score': score})
+            email_tenders |= email_tender
+            bodies[email_tender.id] = _('Possible duplicate of %s synced from the API (similarity %d%%).') % (
+                tender.tender_id, round(score * 100))
+        if email_tenders:
+            email_tenders._message_log_batch(bodies)
+        return email_tenders
+
+    def action_merge_duplicate(self):
+        """Merge flagged email tenders into the tender they duplicate
+
+        Lines, documents, messages, activities and followers move to the
+        synced tender, which also takes over assignment fields it lacks.
+        """
+        target = self.browse()
+        for tender in self.filtered('duplicate_of_id'):
+            target = tender.duplicate_of_id
+            tender.line_ids.write({'tender_id': target.id})
+            tender.document_ids.write({'tender_id': target.id})
+            tender.activity_ids.write({'res_id': target.id})
+            self.env['mail.message'].sudo().search([
+                ('model', '=', self._name), ('res_id', '=', tender.id),
+            ]).write({'res_id': target.id})
+            target.message_subscribe(partner_ids=tender.message_partner_ids.ids)
+            
+            target_vals = {
+                field_name: tender[field_name].id
+                for field_name in ('user_id', 'team_id', 'tender_type_id')
+                if tender[field_name] and not target[field_name]
+            }
+            if target_vals:
+                target.write(target_vals)
+            target.message_post(
+                body=_('Merged email tender %s into this tender.') % tender.tender_id,
+                subtype_xmlid='mail.mt_note',
+            )
+            tender.unlink()
+        
+        if len(target) == 1 and len(self) == 1:
+            return {
+                'type': 'ir.actions.act_window',
+                'res_model': self._name,
+                'res_id': target.id,
+                'view_mode': 'form',
+            }
+        return True
+
+    def action_dismiss_duplicate(self):
+        """Clear the duplicate flag of email tenders that are distinct tenders"""
+        self.write({'duplicate_of_id': False, 'duplicate_score': 0.0})
+        return True
+
+    @api.model
+    def _get_stage_state(self, stage_id):
+        """Return the tender state implied by a stage"""
+        new_stage = self.env['govcon.tender.stage'].browse(stage_id)
         
         if new_stage.is_won:
-            self.state = 'awarded'
+            return 'awarded'
         elif new_stage.is_lost:
-            self.state = 'cancelled'
+            return 'cancelled'
         elif new_stage.is_closed:
-            self.state = 'closed'
-        else:
-            self.state = 'active'
+            return 'closed'
+        return 'active'
 
     @api.model
     def _read_group_stage_ids(self, stages, domain, order):
@@ -223,6 +515,19 @@ class GovconTender(models.Model):
         # Implementation for document generation
         return True
 
+    def action_recompute_analytics(self):
+        """Recompute the pricing analytics of the lines of these tenders"""
+        line_count = self.env['govcon.tender.line']._recompute_pricing_analytics(self.line_ids.ids)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Pricing Analytics'),
+                'message': _('Recomputed the analytics of %d tender lines') % line_count,
+                'type': 'success',
+            }
+        }
+
     def action_sync_with_api(self):
         """Sync tender data with external API"""
         self.ensure_one()
@@ -240,8 +545,40 @@ class GovconTender(models.Model):
                      ('procuring_entity', operator, name),
                      ('description', operator, name),
                      ('procurement_method', operator, name)]
+            if operator == 'ilike' and self._has_pg_trgm():
+                return self._ranked_name_search(name, domain + args, limit, name_get_uid)
         return self._search(domain + args, limit=limit)
 
+    @api.model
+    def _ranked_name_search(self, name, domain, limit, name_get_uid=None):
+        """Return ids matching domain, best matches for name first
+
+        The ilike conditions use the trigram indexes; tender IDs starting
+        with name come first, then entities or methods starting with it,
+        then the closest tender IDs and entities by trigram similarity.
+        """
+        model = self.with_user(name_get_uid) if name_get_uid else self
+        model.check_access_rights('read')
+        query = self._where_calc(domain)
+        self._apply_ir_rules(query, 'read')
+        from_clause, where_clause, where_params = query.get_sql()
+        
+        prefix = name.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        limit_clause = 'LIMIT %s' if limit else ''
+        self.env.cr.execute(f"""
+            SELECT "govcon_tender".id FROM {from_clause}
+             WHERE {where_clause or 'TRUE'}
+             ORDER BY "govcon_tender".tender_id ILIKE %s DESC,
+                      ("govcon_tender".procuring_entity ILIKE %s OR "govcon_tender".procurement_method ILIKE %s) DESC,
+                      greatest(
+                          similarity("govcon_tender".tender_id, %s),
+                          similarity(coalesce("govcon_tender".procuring_entity, ''), %s)
+                      ) DESC,
+                      "govcon_tender".id DESC
+             {limit_clause}
+        """, where_params + [prefix, prefix, prefix, name, name] + ([limit] if limit else []))
+        return [row[0] for row in self.env.cr.fetchall()]
+
     def name_get(self):
         """Custom name display for tenders"""
         result = []
@@ -258,7 +595,7 @@ class GovconTenderLine(models.Model):
     _order = 'sequence, id'
 
     # Basic Information (from ibiDs API - tender articles)
-    tender_id = fields.Many2one('govcon.tender', string='Tender', required=True, ondelete='cascade')
+    tender_id = fields.Many2one('govcon.tender', string='Tender', required=True, ondelete='cascade', index=True)
     article_number = fields.Char('Article Number', required=True, help="Article number from compras")
     article_description = fields.Text('Article Description', required=True, help="Article description from compras")
     lot_info = fields.Char('Lot Info', help="Lot information from compras")
@@ -276,6 +613,7 @@ class GovconTenderLine(models.Model):
     avahi_price_25_quartile = fields.Float('Avahi Price 25th Quartile', help="From ibiDs: avg of where 25% of prices are")
     avahi_price_75_quartile = fields.Float('Avahi Price 75th Quartile', help="From ibiDs: avg of where 75% of prices are")
     competitiveness_rank = fields.Float('Competitiveness Rank', help="From ibiDs: #of tenders for given unspsc / # of offers for that unspsc")
+    local_price_stats = fields.Boolean('Local Price Statistics', readonly=True, help="Quartiles and rank were estimated from the local UNSPSC price history because ibiDs did not provide them")
     
     # Additional Fields
     sequence = fields.Integer('Sequence', default=10)
@@ -318,6 +656,86 @@ class GovconTenderLine(models.Model):
             else:
                 line.price_competitiveness = 'medium'
 
+    def _defer_pricing_analytics(self):
+        """Drop the pending ORM recomputation of the pricing analytics of these lines
+
+        The caller must then run _recompute_pricing_analytics on them.
+        """
+        for field_name in ('total_price', 'price_variance', 'price_competitiveness'):
+            self.env.remove_to_compute(self._fields[field_name], self)
+        Tender = self.env['govcon.tender']
+        self.env.remove_to_compute(Tender._fields['total_line_value'], self.mapped('tender_id'))
+
+    @api.model
+    def _recompute_pricing_analytics(self, line_ids=None, chunk_size=PRICING_ANALYTICS_CHUNK_SIZE):
+        """Recompute the pricing analytics of the given lines, or of all lines, in bulk
+
+        Each chunk is read with one query, computed column-wise and written
+        back with one UPDATE, then the line totals of the affected tenders
+        are summed in SQL. Returns the number of lines recomputed.
+        """
+        if line_ids is not None:
+            if not line_ids:
+                return 0
+            line_ids = sorted(set(line_ids))
+        self.flush()
+        cr = self.env.cr
+        
+        recomputed_count = 0
+        offset = 0
+        last_id = 0
+        tender_ids = set()
+        while True:
+            # Chunks of the given ids, or keyset pages over the whole table
+            if line_ids is None:
+                condition, params = 'id > %s ORDER BY id LIMIT %s', (last_id, chunk_size)
+            else:
+                chunk_ids = tuple(line_ids[offset:offset + chunk_size])
+                offset += chunk_size
+                if not chunk_ids:
+                    break
+                condition, params = 'id IN %s', (chunk_ids,)
+            cr.execute(f"""
+                SELECT id, tender_id, COALESCE(unit_price, 0), COALESCE(quantity, 0),
+                       COALESCE(ibids_estimated_price, 0), COALESCE(competitiveness_rank, 0)
+                  FROM govcon_tender_line WHERE {condition}
+            """, params)
+            rows = cr.fetchall()
+            if not rows:
+                if line_ids is None:
+                    break
+                continue
+            
+            ids, chunk_tender_ids, unit_prices, quantities, estimated_prices, ranks = zip(*rows)
+            total_prices, price_variances, competitiveness = compute_pricing_analytics(
+                unit_prices, quantities, estimated_prices, ranks)
+            values = ', '.join(['(%s, %s, %s, %s)'] * len(ids))
+            params = [item for row in zip(ids, total_prices, price_variances, competitiveness) for item in row]
+            cr.execute(f"""
+                UPDATE govcon_tender_line AS line
+                   SET total_price = data.total_price,
+                       price_variance = data.price_variance,
+                       price_competitiveness = data.price_competitiveness
+                  FROM (VALUES {values}) AS data(id, total_price, price_variance, price_competitiveness)
+                 WHERE line.id = data.id
+            """, params)
+            
+            tender_ids.update(chunk_tender_ids)
+            last_id = ids[-1]
+            recomputed_count += len(ids)
+        
+        if tender_ids:
+            cr.execute("""
+                UPDATE govcon_tender AS tender
+                   SET total_line_value = COALESCE(
+                       (SELECT SUM(line.total_price) FROM govcon_tender_line line WHERE line.tender_id = tender.id), 0)
+                 WHERE tender.id IN %s
+            """, (tuple(tender_ids),))
+            self.env['govcon.tender.pipeline.dirty']._mark_tenders(tender_ids)
+        self.invalidate_cache(['total_price', 'price_variance', 'price_competitiveness'])
+        self.env['govcon.tender'].invalidate_cache(['total_line_value'], list(tender_ids))
+        return recomputed_count
+
     @api.constrains('quantity', 'unit_price')
     def _check_positive_values(self):
         """Ensure quantity and unit price are positive"""
@@ -1,5 +1,14 @@
-from odoo import models, fields, api, _
-from datetime import datetime
+from odoo import models, fields, api, tools, _
+from datetime import datetime, timedelta
+
+# Keywords of API date names, used to auto-discover the role of a new date field
+DATE_ROLE_KEYWORDS = [
+    ('deadline', ['deadline', 'cierre', 'limite', 'límite', 'closing', 'submission', 'presentacion', 'presentación', 'recepcion', 'recepción']),
+    ('awarded', ['adjudica', 'award']),
+    ('evaluation', ['evalua']),
+    ('published', ['publica', 'publish']),
+    ('created', ['creacion', 'creación', 'created', 'creation']),
+]
 
 class DateField(models.Model):
     _name = 'govcon.date.field'
@@ -20,6 +29,13 @@ class DateField(models.Model):
     is_deadline = fields.Boolean('Is Deadline', default=False)
     is_milestone = fields.Boolean('Is Milestone', default=False)
     is_critical = fields.Boolean('Critical Date', default=False)
+    tender_date_role = fields.Selection([
+        ('created', 'Date Created'),
+        ('published', 'Date Published'),
+        ('deadline', 'Submission Deadline'),
+        ('evaluation', 'Evaluation Date'),
+        ('awarded', 'Date Awarded')
+    ], string='Tender Date Role', help="Stored tender date computed from this field")
     
     # Usage tracking
     usage_count = fields.Integer('Times Used', default=0)
@@ -43,6 +59,54 @@ class DateField(models.Model):
          'API field name must be unique!')
     ]
 
+    @api.model
+    def _guess_date_role(self, api_field_name):
+        """Guess the tender date role of an API date name from its keywords"""
+        name = api_field_name.lower()
+        for role, keywords in DATE_ROLE_KEYWORDS:
+            if any(keyword in name for keyword in keywords):
+                return role
+        return False
+
+    @api.model
+    def _register_api_fields(self, api_field_names):
+        """Return {api_field_name: record}, creating unseen fields in one batch"""
+        api_field_names = set(api_field_names)
+        date_fields = {
+            date_field.api_field_name: date_field
+            for date_field in self.search([('api_field_name', 'in', list(api_field_names))])
+        }
+        missing = sorted(api_field_names - set(date_fields))
+        if missing:
+            vals_list = []
+            for api_field_name in missing:
+                role = self._guess_date_role(api_field_name)
+                vals_list.append({
+                    'name': api_field_name.replace('_', ' ').strip().capitalize(),
+                    'api_field_name': api_field_name,
+                    'tender_date_role': role,
+                    'is_deadline': role == 'deadline',
+                    'is_critical': role == 'deadline',
+                    'is_milestone': bool(role),
+                })
+            for date_field in self.create(vals_list):
+                date_fields[date_field.api_field_name] = date_field
+        return date_fields
+
+    def _increment_usage(self, counts):
+        """Add {date_field_id: count} to usage_count in a single statement"""
+        if not counts:
+            return
+        values = ', '.join(['(%s, %s)'] * len(counts))
+        params = [item for pair in counts.items() for item in pair]
+        self.env.cr.execute(f"""
+            UPDATE govcon_date_field AS df
+               SET usage_count = COALESCE(df.usage_count, 0) + data.count
+              FROM (VALUES {values}) AS data(id, count)
+             WHERE df.id = data.id
+        """, params)
+        self.invalidate_cache(['usage_count'], list(counts))
+
 class TenderDateValue(models.Model):
     _name = 'govcon.tender.date'
     _description = 'Tender Date Values'
@@ -69,6 +133,11 @@ class TenderDateValue(models.Model):
         ('unique_tender_date_field', 'unique(tender_id, date_field_id)', 
          'Each date field can only have one value per tender!')
     ]
+
+    def init(self):
+        """Calendar index used by the upcoming deadline queries"""
+        tools.create_index(self._cr, 'govcon_tender_date_field_value_index',
+                           self._table, ['date_field_id', 'date_value'])
     
     @api.onchange('date_value')
     def _onchange_date_value(self):
@@ -78,6 +147,144 @@ class TenderDateValue(models.Model):
     
     def write(self, vals):
         """Track previous value before updating"""
-        if 'date_value' in vals and self.date_value:
-            vals['previous_value'] = self.date_value
-        return super().write(vals) 
\ No newline at end of file
+        if 'date_value' in vals and any(self.mapped('date_value')):
+            for record in self:
+                record_vals = dict(vals)
+                if record.date_value:
+                    record_vals['previous_value'] = record.date_value
+                super(TenderDateValue, record).write(record_vals)
+            return True
+        return super().write(vals)
+
+    @api.model
+    def _sync_tender_timelines(self, timelines):
+        """Store parsed API timelines {tender: {api_field_name: datetime}} in bulk
+
+        Unseen date fields are registered in one batch, existing rows are
+        read with one query, new rows are created with one create and
+        changed values are written with a single UPDATE.
+        """
+        timelines = {tender: timeline for tender, timeline in timelines.items() if timeline}
+        if not timelines:
+            return
+        date_fields = self.env['govcon.date.field']._register_api_fields(
+            name for timeline in timelines.values() for name in timeline
+        )
+        tender_ids = [tender.id for tender in timelines]
+        existing = {
+            (row.tender_id.id, row.date_field_id.id): row
+            for row in self.search([('tender_id', 'in', tender_ids)])
+        }
+        
+        now = fields.Datetime.now()
+        create_vals_list = []
+        updates = {}
+        usage_counts = {}
+        for tender, timeline in timelines.items():
+            for api_field_name, date_value in timeline.items():
+                date_field = date_fields[api_field_name]
+                row = existing.get((tender.id, date_field.id))
+                if row is None:
+                    create_vals_list.append({
+                        'tender_id': tender.id,
+                        'date_field_id': date_field.id,
+                        'date_value': date_value,
+                        'source': 'api',
+                        'last_updated': now,
+                    })
+                    usage_counts[date_field.id] = usage_counts.get(date_field.id, 0) + 1
+                elif row.date_value != date_value:
+                    updates[row.id] = date_value
+        if create_vals_list:
+            self.create(create_vals_list)
+        self._update_api_date_values(updates, now)
+        self.env['govcon.date.field']._increment_usage(usage_counts) 
+
+    @api.model
+    def _update_api_date_values(self, updates, now):
+        """Write {row id: date_value} synced from the API with a single UPDATE
+
+        Like write(), the replaced value is kept as previous_value. The
+        tender dates computed from these rows are marked for recomputation.
+        """
+        if not updates:
+            return
+        fnames = ['date_value', 'previous_value', 'source', 'last_updated', 'write_uid', 'write_date']
+        self.flush(fnames)
+        values = ', '.join(['(%s, %s::timestamp)'] * len(updates))
+        params = [item for pair in updates.items() for item in pair]
+        self.env.cr.execute(f"""
+            UPDATE govcon_tender_date AS td
+               SET previous_value = COALESCE(td.date_value, td.previous_value),
+                   date_value = data.date_value,
+                   source = 'api_sync',
+                   last_updated = %s,
+                   write_uid = %s,
+                   write_date = %s
+              FROM (VALUES {values}) AS data(id, date_value)
+             WHERE td.id = data.id
+        """, [now, self.env.uid, now] + params)
+        rows = self.browse(list(updates))
+        self.invalidate_cache(fnames, rows.ids)
+        rows.modified(['date_value'])
+
+    @api.model
+    def get_upcoming_deadlines(self, days=30, limit=80, offset=0, cursor=None, date_from=None):
+        """Upcoming deadline and critical dates across all tenders
+
+        Only date fields flagged is_deadline or is_critical are scanned,
+        through the (date_field_id, date_value) index. Pages are ordered by
+        date; pass the returned next_cursor back as cursor for keyset
+        pagination (calendar view), or use limit/offset.
+
+        Returns {'records': [dict], 'next_cursor': str or False}.
+        """
+        self.check_access_rights('read')
+        self.env['govcon.tender'].check_access_rights('read')
+        
+        date_fields = self.env['govcon.date.field'].search_read(
+            ['|', ('is_deadline', '=', True), ('is_critical', '=', True)],
+            ['name', 'is_deadline', 'is_critical'],
+        )
+        if not date_fields:
+            return {'records': [], 'next_cursor': False}
+        date_fields = {date_field['id']: date_field for date_field in date_fields}
+        
+        date_from = fields.Datetime.to_datetime(date_from) or fields.Datetime.now()
+        date_to = date_from + timedelta(days=days)
+        query = """
+            SELECT td.id, td.date_value, td.date_field_id, t.id, t.tender_id, t.procuring_entity, t.stage_id, t.user_id
+              FROM govcon_tender_date td
+              JOIN govcon_tender t ON t.id = td.tender_id
+             WHERE td.date_field_id = ANY(%s)
+               AND td.date_value >= %s AND td.date_value < %s
+        """
+        params = [list(date_fields), date_from, date_to]
+        if cursor:
+            cursor_date, cursor_id = cursor.rsplit('|', 1)
+            query += " AND (td.date_value, td.id) > (%s, %s)"
+            params += [fields.Datetime.to_datetime(cursor_date), int(cursor_id)]
+        query += " ORDER BY td.date_value, td.id LIMIT %s OFFSET %s"
+        params += [limit, offset]
+        self.env.cr.execute(query, params)
+        
+        records = []
+        for row_id, date_value, date_field_id, tender_id, tender_ref, entity, stage_id, user_id in self.env.cr.fetchall():
+            date_field = date_fields[date_field_id]
+            records.append({
+                'id': row_id,
+                'date_value': fields.Datetime.to_string(date_value),
+                'date_field_id': date_field_id,
+                'date_field_name': date_field['name'],
+                'is_deadline': date_field['is_deadline'],
+                'is_critical': date_field['is_critical'],
+                'tender_id': tender_id,
+                'tender_ref': tender_ref,
+                'procuring_entity': entity,
+                'stage_id': stage_id,
+                'user_id': user_id,
+            })
+        next_cursor = False
+        if limit and len(records) == limit:
+            next_cursor = '%s|%s' % (records[-1]['date_value'], records[-1]['id'])
+        return {'records': records, 'next_cursor': next_cursor}
@@ -0,0 +1,115 @@
+from odoo import models, fields, api, _
+from .tender_type import normalize_keyword_text
+import logging
+import random
+import re
+import zlib
+
+_logger = logging.getLogger(__name__)
+
+# Prefix of the fallback IDs given to tenders created from emails
+EMAIL_TENDER_PREFIX = 'EMAIL_'
+
+# Normalized entity + description kept for comparison
+DEDUPE_TEXT_LENGTH = 500
+SHINGLE_SIZE = 4
+
+# MinHash LSH: 20 bands of 3 rows flag ~93% of pairs at similarity 0.5
+MINHASH_BANDS = 20
+MINHASH_BAND_ROWS = 3
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+MINHASH_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_BANDS * MINHASH_BAND_ROWS)
+]
+
+# A candidate is a duplicate when its text is this similar and its value is this close
+DUPLICATE_SIMILARITY = 0.5
+DUPLICATE_VALUE_TOLERANCE = 0.05
+
+_NON_WORD_RE = re.compile(r'[^0-9a-z]+')
+
+
+def dedupe_text(procuring_entity, description):
+    """Accent-free lowercase words of the entity and description used for matching"""
+    text = normalize_keyword_text(f'{procuring_entity or ""} {description or ""}')
+    return _NON_WORD_RE.sub(' ', text).strip()[:DEDUPE_TEXT_LENGTH]
+
+
+def minhash_signature(text):
+    """MinHash signature of the character shingles of text, None for empty text"""
+    if not text:
+        return None
+    hashes = {
+        zlib.crc32(text[index:index + SHINGLE_SIZE].encode())
+        for index in range(max(len(text) - SHINGLE_SIZE + 1, 1))
+    }
+    return [min((a * value + b) % _MERSENNE_PRIME for value in hashes) for a, b in MINHASH_PERMUTATIONS]
+
+
+def minhash_band_keys(signature):
+    """LSH bucket keys of a signature, one per band"""
+    return [
+        f'{band}:{zlib.crc32(repr(signature[band * MINHASH_BAND_ROWS:(band + 1) * MINHASH_BAND_ROWS]).encode()):08x}'
+        for band in range(MINHASH_BANDS)
+    ]
+
+
+def minhash_similarity(signature, other_signature):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return sum(1 for a, b in zip(signature, other_signature) if a == b) / len(signature)
+
+
+def values_match(value, other_value):
+    """Whether two tender values agree, an unknown value matches anything"""
+    if not value or not other_value:
+        return True
+    return abs(value - other_value) <= DUPLICATE_VALUE_TOLERANCE * max(abs(value), abs(other_value))
+
+
+class GovconTenderDedupeBand(models.Model):
+    _name = 'govcon.tender.dedupe.band'
+    _description = 'Tender Duplicate Detection Bucket'
+    _log_access = False
+
+    tender_id = fields.Many2one('govcon.tender', string='Tender', required=True, ondelete='cascade', index=True)
+    band_key = fields.Char('Band Key', required=True, index=True)
+
+    @api.model
+    def _index_tenders(self, tenders):
+        """Replace the LSH buckets of tenders with those of their current text"""
+        self.search([('tender_id', 'in', tenders.ids)]).unlink()
+        vals_list = []
+        for tender in tenders:
+            signature = minhash_signature(tender.dedupe_text)
+            if signature:
+                vals_list.extend(
+                    {'tender_id': tender.id, 'band_key': band_key}
+                    for band_key in minhash_band_keys(signature)
+                )
+        self.create(vals_list)
+
+    @api.model
+    def _find_candidates(self, signatures):
+        """Map each key of signatures to the ids of email tenders sharing a bucket with it
+
+        All buckets of the batch are looked up with a single query.
+        """
+        keys_by_band = {}
+        for key, signature in signatures.items():
+            for band_key in minhash_band_keys(signature):
+                keys_by_band.setdefault(band_key, []).append(key)
+        candidates = {key: set() for key in signatures}
+        if not keys_by_band:
+            return candidates
+        self.env.cr.execute("""
+            SELECT band.band_key, band.tender_id
+              FROM govcon_tender_dedupe_band band
+              JOIN govcon_tender tender ON tender.id = band.tender_id
+             WHERE band.band_key IN %s AND tender.duplicate_of_id IS NULL
+        """, (tuple(keys_by_band),))
+        for band_key, tender_id in self.env.cr.fetchall():
+            for key in keys_by_band[band_key]:
+                candidates[key].add(tender_id)
+        return candidates
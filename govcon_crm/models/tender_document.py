@@ -5,6 +5,6 @@ class TenderDocument(models.Model):
     _description = 'Tender Documents'
     
     name = fields.Char('Document Name', required=True)
-    tender_id = fields.Many2one('govcon.tender', string='Tender', required=True)
+    tender_id = fields.Many2one('govcon.tender', string='Tender', required=True, index=True)
     document_file = fields.Binary('Document File')
     document_filename = fields.Char('Filename') 
\ No newline at end of file
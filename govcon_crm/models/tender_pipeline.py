@@ -0,0 +1,184 @@
+from odoo import models, fields, api, _
+from odoo.tools import create_index
+import logging
+import threading
+
+_logger = logging.getLogger(__name__)
+
+# Key columns of a tender in the summary, as SQL over govcon_tender
+PIPELINE_KEY_SQL = """
+    tender.stage_id, tender.state, tender.team_id, tender.user_id,
+    date_trunc('month', tender.date_deadline::timestamp)::date
+"""
+
+class GovconTenderPipelineDirty(models.Model):
+    _name = 'govcon.tender.pipeline.dirty'
+    _description = 'Pending Tender Pipeline Summary Key'
+    _log_access = False
+
+    # Plain ids so marking a key never locks the referenced records
+    stage_id = fields.Integer('Stage')
+    state = fields.Char('Status')
+    team_id = fields.Integer('Team')
+    user_id = fields.Integer('Assigned To')
+    deadline_month = fields.Date('Deadline Month')
+
+    @api.model
+    def _mark_tenders(self, tender_ids):
+        """Queue the current summary keys of the given tenders for refresh"""
+        if not tender_ids:
+            return
+        self.env.cr.execute(f"""
+            INSERT INTO govcon_tender_pipeline_dirty (stage_id, state, team_id, user_id, deadline_month)
+            SELECT DISTINCT {PIPELINE_KEY_SQL} FROM govcon_tender AS tender WHERE tender.id IN %s
+        """, (tuple(tender_ids),))
+
+class GovconTenderPipelineSummary(models.Model):
+    _name = 'govcon.tender.pipeline.summary'
+    _description = 'Tender Pipeline Summary'
+    _order = 'deadline_month, stage_id'
+    _log_access = False
+
+    # Dimensions
+    stage_id = fields.Many2one('govcon.tender.stage', string='Stage', readonly=True, ondelete='cascade')
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('active', 'Active'),
+        ('evaluation', 'Under Evaluation'),
+        ('awarded', 'Awarded'),
+        ('cancelled', 'Cancelled'),
+        ('closed', 'Closed')
+    ], string='Status', readonly=True)
+    team_id = fields.Many2one('govcon.tender.team', string='Team', readonly=True, ondelete='cascade')
+    user_id = fields.Many2one('res.users', string='Assigned To', readonly=True, ondelete='cascade')
+    deadline_month = fields.Date('Deadline Month', readonly=True)
+
+    # Measures
+    tender_count = fields.Integer('Tenders', readonly=True)
+    tender_value = fields.Float('Tender Value', readonly=True)
+    estimated_value = fields.Float('Estimated Value', readonly=True)
+    total_line_value = fields.Float('Total Line Value', readonly=True)
+    win_probability_sum = fields.Float('Win Probability Sum', readonly=True, help="Sum of the win probabilities, divided by the tender count for the average")
+
+    def init(self):
+        """Index the summary and tender keys, and fill an empty summary"""
+        create_index(self.env.cr, 'govcon_tender_pipeline_summary_key_index', self._table, [
+            'COALESCE(stage_id, 0)', "COALESCE(state, '')", 'COALESCE(team_id, 0)', 'COALESCE(user_id, 0)',
+            "COALESCE(deadline_month, '1970-01-01')",
+        ])
+        create_index(self.env.cr, 'govcon_tender_pipeline_key_index', 'govcon_tender', [
+            'COALESCE(stage_id, 0)', "COALESCE(state, '')", 'COALESCE(team_id, 0)', 'COALESCE(user_id, 0)',
+            "COALESCE(date_trunc('month', date_deadline::timestamp)::date, '1970-01-01')",
+        ])
+        self.env.cr.execute("SELECT 1 FROM govcon_tender_pipeline_summary LIMIT 1")
+        if not self.env.cr.fetchone():
+            self._rebuild_summary()
+
+    @api.model
+    def _rebuild_summary(self):
+        """Recompute the whole summary from the tender table"""
+        self.env.cr.execute("SELECT pg_advisory_xact_lock(hashtext('govcon_tender_pipeline_summary'))")
+        self.env.cr.execute("DELETE FROM govcon_tender_pipeline_dirty")
+        self.env.cr.execute("DELETE FROM govcon_tender_pipeline_summary")
+        self.env.cr.execute(f"""
+            INSERT INTO govcon_tender_pipeline_summary (
+                stage_id, state, team_id, user_id, deadline_month,
+                tender_count, tender_value, estimated_value, total_line_value, win_probability_sum)
+            SELECT {PIPELINE_KEY_SQL}, COUNT(*), SUM(COALESCE(tender.tender_value, 0)), SUM(COALESCE(tender.estimated_value, 0)),
+                   SUM(COALESCE(tender.total_line_value, 0)), SUM(COALESCE(tender.win_probability, 0))
+              FROM govcon_tender AS tender
+             GROUP BY 1, 2, 3, 4, 5
+        """)
+        self.invalidate_cache()
+
+    @api.model
+    def _refresh_summary(self, wait=True):
+        """Recompute the summary rows of the keys marked dirty since the last refresh
+
+        Only the tenders of those keys are aggregated, through the key index.
+        Refreshes are serialized with an advisory lock; tender writes only
+        insert dirty keys and never wait on summary rows. Without wait the
+        refresh is skipped when another one holds the lock. Returns the
+        number of refreshed keys.
+        """
+        cr = self.env.cr
+        if wait:
+            cr.execute("SELECT pg_advisory_xact_lock(hashtext('govcon_tender_pipeline_summary'))")
+        else:
+            cr.execute("SELECT pg_try_advisory_xact_lock(hashtext('govcon_tender_pipeline_summary'))")
+            if not cr.fetchone()[0]:
+                return 0
+        cr.execute("""
+            WITH dirty AS (
+                DELETE FROM govcon_tender_pipeline_dirty
+                RETURNING stage_id, state, team_id, user_id, deadline_month
+            )
+            SELECT DISTINCT COALESCE(stage_id, 0), COALESCE(state, ''), COALESCE(team_id, 0), COALESCE(user_id, 0),
+                   COALESCE(deadline_month, '1970-01-01')
+              FROM dirty
+        """)
+        keys = cr.fetchall()
+        if not keys:
+            return 0
+        
+        values = ', '.join(['(%s::int, %s::varchar, %s::int, %s::int, %s::date)'] * len(keys))
+        params = [item for key in keys for item in key]
+        cr.execute(f"""
+            DELETE FROM govcon_tender_pipeline_summary AS summary
+             USING (VALUES {values}) AS refresh(stage_id, state, team_id, user_id, deadline_month)
+             WHERE COALESCE(summary.stage_id, 0) = refresh.stage_id
+               AND COALESCE(summary.state, '') = refresh.state
+               AND COALESCE(summary.team_id, 0) = refresh.team_id
+               AND COALESCE(summary.user_id, 0) = refresh.user_id
+               AND COALESCE(summary.deadline_month, '1970-01-01') = refresh.deadline_month
+        """, params)
+        cr.execute(f"""
+            INSERT INTO govcon_tender_pipeline_summary (
+                stage_id, state, team_id, user_id, deadline_month,
+                tender_count, tender_value, estimated_value, total_line_value, win_probability_sum)
+            SELECT {PIPELINE_KEY_SQL}, COUNT(*), SUM(COALESCE(tender.tender_value, 0)), SUM(COALESCE(tender.estimated_value, 0)),
+                   SUM(COALESCE(tender.total_line_value, 0)), SUM(COALESCE(tender.win_probability, 0))
+              FROM govcon_tender AS tender
+              JOIN (VALUES {values}) AS refresh(stage_id, state, team_id, user_id, deadline_month)
+                ON COALESCE(tender.stage_id, 0) = refresh.stage_id
+               AND COALESCE(tender.state, '') = refresh.state
+               AND COALESCE(tender.team_id, 0) = refresh.team_id
+               AND COALESCE(tender.user_id, 0) = refresh.user_id
+               AND COALESCE(date_trunc('month', tender.date_deadline::timestamp)::date, '1970-01-01') = refresh.deadline_month
+             GROUP BY 1, 2, 3, 4, 5
+        """, params)
+        self.invalidate_cache()
+        return len(keys)
+
+    @api.model
+    def get_dashboard_data(self, groupby=None, domain=None):
+        """Pipeline totals grouped by the given dimensions, read from the summary
+
+        groupby is a list of 'stage_id', 'state', 'team_id', 'user_id' or
+        'deadline_month[:granularity]'. Pending tender changes are folded in
+        first when there are any and no other refresh is running; otherwise
+        the summary is read as the cron last left it.
+        """
+        self.env.cr.execute("SELECT 1 FROM govcon_tender_pipeline_dirty LIMIT 1")
+        if self.env.cr.fetchone():
+            self._refresh_summary(wait=False)
+        groupby = groupby or ['stage_id']
+        measures = ['tender_count', 'tender_value', 'estimated_value', 'total_line_value', 'win_probability_sum']
+        groups = self.read_group(domain or [], measures, groupby, lazy=False)
+        result = []
+        for group in groups:
+            data = {name: group[name] for name in groupby}
+            data.update({name: group[name] or 0 for name in measures if name != 'win_probability_sum'})
+            data['win_probability'] = group['win_probability_sum'] / group['tender_count'] if group['tender_count'] else 0.0
+            result.append(data)
+        return result
+
+    @api.model
+    def _cron_refresh_summary(self):
+        """Cron job folding pending tender changes into the pipeline summary"""
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        key_count = self._refresh_summary()
+        if key_count:
+            _logger.info(f"Refreshed {key_count} pipeline summary keys")
+        if auto_commit:
+            self.env.cr.commit()
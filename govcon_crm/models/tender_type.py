@@ -1,4 +1,55 @@
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
+from collections import deque
+import unicodedata
+
+
+def normalize_keyword_text(text):
+    """Lowercase text and strip accents so keywords match with or without them"""
+    text = unicodedata.normalize('NFKD', (text or '').lower())
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton matching many keywords in a single pass over a text"""
+
+    def __init__(self, keywords):
+        """Build the automaton from (keyword, value) pairs of normalized keywords"""
+        self.transitions = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+        for keyword, value in keywords:
+            state = 0
+            for char in keyword:
+                if char not in self.transitions[state]:
+                    self.transitions.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                    self.transitions[state][char] = len(self.transitions) - 1
+                state = self.transitions[state][char]
+            self.outputs[state].append((len(keyword), value))
+
+        # Breadth-first pass to link every state to its longest proper suffix
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.transitions[fallback].get(char, 0)
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+
+    def iter_matches(self, text):
+        """Yield (start, end, value) for every keyword occurrence in text"""
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self.transitions[state]:
+                state = self.fail[state]
+            state = self.transitions[state].get(char, 0)
+            for length, value in self.outputs[state]:
+                yield index + 1 - length, index + 1, value
+
 
 class TenderType(models.Model):
     _name = 'govcon.tender.type'
@@ -19,17 +70,80 @@ class TenderType(models.Model):
     # Auto-classification from API
     api_classification_keywords = fields.Text('API Classification Keywords')
     
-    # Tender count
-    tender_count = fields.Integer('Number of Tenders', compute='_compute_tender_count')
+    # Tender count (stored so the type list can search and sort on it)
+    tender_count = fields.Integer('Number of Tenders', compute='_compute_tender_count', store=True)
     
     @api.depends('tender_ids')
     def _compute_tender_count(self):
+        type_ids = [record.id for record in self if not isinstance(record.id, models.NewId)]
+        groups = self.env['govcon.tender'].read_group(
+            [('tender_type_id', 'in', type_ids)], ['tender_type_id'], ['tender_type_id'], lazy=False,
+        ) if type_ids else []
+        counts = {group['tender_type_id'][0]: group['__count'] for group in groups}
         for record in self:
-            record.tender_count = len(record.tender_ids)
+            if isinstance(record.id, models.NewId):
+                record.tender_count = len(record.tender_ids)
+            else:
+                record.tender_count = counts.get(record.id, 0)
     
     # Related field for tender count
     tender_ids = fields.One2many('govcon.tender', 'tender_type_id', 'Tenders')
     
     _sql_constraints = [
         ('unique_code', 'unique(code)', 'Tender type code must be unique!')
-    ] 
\ No newline at end of file
+    ]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Reset the classifier when tender types change"""
+        records = super().create(vals_list)
+        self.clear_caches()
+        return records
+
+    def write(self, vals):
+        """Reset the classifier when tender types change"""
+        result = super().write(vals)
+        if {'api_classification_keywords', 'sequence', 'name'} & set(vals):
+            self.clear_caches()
+        return result
+
+    def unlink(self):
+        """Reset the classifier when tender types change"""
+        result = super().unlink()
+        self.clear_caches()
+        return result
+
+    @api.model
+    @tools.ormcache()
+    def _get_classifier(self):
+        """Keyword automaton over all classification keywords, cached per registry
+
+        Returns (automaton, {type_id: rank}); only ids are cached, never records.
+        """
+        keywords = []
+        ranks = {}
+        for rank, tender_type in enumerate(self.sudo().search([])):
+            ranks[tender_type.id] = rank
+            for keyword in (tender_type.api_classification_keywords or '').split(','):
+                keyword = normalize_keyword_text(keyword.strip())
+                if keyword:
+                    keywords.append((keyword, tender_type.id))
+        return KeywordAutomaton(keywords), ranks
+
+    @api.model
+    def _classify_text(self, text):
+        """Return the tender type whose keywords best match text, without any query
+
+        Each whole-word keyword hit scores its length, so longer and more
+        specific phrases win; ties go to the type with the lowest sequence.
+        """
+        automaton, ranks = self._get_classifier()
+        text = normalize_keyword_text(text)
+        scores = {}
+        for start, end, type_id in automaton.iter_matches(text):
+            if (start and text[start - 1].isalnum()) or (end < len(text) and text[end].isalnum()):
+                continue
+            scores[type_id] = scores.get(type_id, 0) + end - start
+        if not scores:
+            return self.browse()
+        return self.browse(max(scores, key=lambda type_id: (scores[type_id], -ranks[type_id]))) 
\ No newline at end of file
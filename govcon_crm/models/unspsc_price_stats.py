@@ -0,0 +1,304 @@
+from odoo import models, fields, api, _
+import json
+import logging
+import math
+import threading
+
+_logger = logging.getLogger(__name__)
+
+# Centroid budget of the t-digests, higher is more accurate and larger
+TDIGEST_COMPRESSION = 100
+
+# Prices needed before local statistics are trusted to fill tender lines
+MIN_PRICE_SAMPLES = 5
+
+# Prices buffered per UNSPSC code before they are merged into its digest
+REBUILD_BUFFER_SIZE = 1000
+REBUILD_CHUNK_SIZE = 10000
+
+
+class TDigest:
+    """Merging t-digest: a mergeable sketch of a distribution with accurate tail quantiles
+
+    Centroids are kept sorted as [mean, weight]; adjacent centroids are
+    merged while they span at most one unit of the arcsine scale function,
+    so centroids are small near the tails and there are O(compression) of them.
+    """
+
+    def __init__(self, compression=TDIGEST_COMPRESSION, centroids=None, min_value=None, max_value=None):
+        self.compression = compression
+        self.centroids = centroids or []
+        self.count = sum(weight for mean, weight in self.centroids)
+        self.min_value = min_value
+        self.max_value = max_value
+
+    @classmethod
+    def from_json(cls, data):
+        """Load a digest serialized with to_json, an empty digest for no data"""
+        if not data:
+            return cls()
+        data = json.loads(data)
+        return cls(data['compression'], data['centroids'], data['min'], data['max'])
+
+    def to_json(self):
+        """Serialize the digest to compact JSON"""
+        return json.dumps({
+            'compression': self.compression,
+            'min': self.min_value,
+            'max': self.max_value,
+            'centroids': [[round(mean, 6), weight] for mean, weight in self.centroids],
+        }, separators=(',', ':'))
+
+    def update(self, values):
+        """Add a batch of values, merging them with the centroids in one sorted pass"""
+        values = [float(value) for value in values]
+        if not values:
+            return
+        self.min_value = min(values) if self.min_value is None else min(self.min_value, *values)
+        self.max_value = max(values) if self.max_value is None else max(self.max_value, *values)
+        points = sorted(self.centroids + [[value, 1] for value in values])
+        total = self.count + len(values)
+
+        merged = []
+        cumulative = 0
+        for mean, weight in points:
+            if merged:
+                last = merged[-1]
+                if self._scale((cumulative + last[1] + weight) / total) - self._scale(cumulative / total) <= 1:
+                    last[1] += weight
+                    last[0] += (mean - last[0]) * weight / last[1]
+                    continue
+                cumulative += last[1]
+            merged.append([mean, weight])
+        self.centroids = merged
+        self.count = total
+
+    def _scale(self, quantile):
+        """Arcsine scale function mapping quantiles to centroid index units"""
+        return self.compression / (2 * math.pi) * math.asin(2 * min(quantile, 1.0) - 1)
+
+    def quantile(self, quantile):
+        """Estimated value at the given quantile (0 to 1), None when empty"""
+        if not self.centroids:
+            return None
+        target = quantile * self.count
+        previous_mean, previous_center = self.min_value, 0
+        cumulative = 0
+        for mean, weight in self.centroids:
+            center = cumulative + weight / 2
+            if target < center:
+                return previous_mean + (mean - previous_mean) * (target - previous_center) / (center - previous_center)
+            previous_mean, previous_center = mean, center
+            cumulative += weight
+        if self.count == previous_center:
+            return self.max_value
+        return previous_mean + (self.max_value - previous_mean) * (target - previous_center) / (self.count - previous_center)
+
+    def cdf(self, value):
+        """Estimated fraction of the values below value, None when empty"""
+        if not self.centroids:
+            return None
+        if value <= self.min_value:
+            return 0.0
+        if value >= self.max_value:
+            return 1.0
+        previous_mean, previous_center = self.min_value, 0
+        cumulative = 0
+        for mean, weight in self.centroids:
+            center = cumulative + weight / 2
+            if value < mean:
+                return (previous_center + (center - previous_center) * (value - previous_mean) / (mean - previous_mean)) / self.count
+            previous_mean, previous_center = mean, center
+            cumulative += weight
+        return (previous_center + (self.count - previous_center) * (value - previous_mean) / (self.max_value - previous_mean)) / self.count
+
+
+class GovconUnspscPriceStats(models.Model):
+    _name = 'govcon.unspsc.price.stats'
+    _description = 'UNSPSC Price Statistics'
+    _rec_name = 'unspsc_code'
+    _order = 'unspsc_code'
+
+    unspsc_code = fields.Char('UNSPSC Code', required=True, index=True)
+    sample_count = fields.Integer('Prices', readonly=True)
+    price_25_quartile = fields.Float('Price 25th Quartile', readonly=True)
+    price_median = fields.Float('Median Price', readonly=True)
+    price_75_quartile = fields.Float('Price 75th Quartile', readonly=True)
+    sketch = fields.Text('Quantile Sketch', readonly=True, help="Serialized t-digest of the unit prices of the code")
+
+    _sql_constraints = [
+        ('unique_unspsc_code', 'unique(unspsc_code)', 'UNSPSC code must be unique!')
+    ]
+
+    @api.model
+    def _get_digests(self, codes):
+        """Return {unspsc_code: TDigest} for the codes with statistics, with one search"""
+        return {
+            stats.unspsc_code: TDigest.from_json(stats.sketch)
+            for stats in self.search([('unspsc_code', 'in', list(codes))])
+        }
+
+    @api.model
+    def _store_digests(self, digests):
+        """Save {unspsc_code: TDigest}, creating the missing codes in one create"""
+        existing = {stats.unspsc_code: stats for stats in self.search([('unspsc_code', 'in', list(digests))])}
+        create_vals_list = []
+        for code, digest in digests.items():
+            vals = {
+                'sample_count': digest.count,
+                'price_25_quartile': digest.quantile(0.25),
+                'price_median': digest.quantile(0.5),
+                'price_75_quartile': digest.quantile(0.75),
+                'sketch': digest.to_json(),
+            }
+            if code in existing:
+                existing[code].write(vals)
+            else:
+                create_vals_list.append(dict(vals, unspsc_code=code))
+        if create_vals_list:
+            self.create(create_vals_list)
+
+    @api.model
+    def _add_line_prices(self, lines):
+        """Merge the unit prices of new tender lines into the digests of their codes
+
+        The API sync calls this once per page with the lines it created;
+        lines created elsewhere are picked up by the weekly rebuild.
+        """
+        prices_by_code = {}
+        for line in lines:
+            if line.unspsc_code and line.unit_price > 0:
+                prices_by_code.setdefault(line.unspsc_code, []).append(line.unit_price)
+        if not prices_by_code:
+            return
+        digests = self._get_digests(prices_by_code)
+        for code, prices in prices_by_code.items():
+            digests.setdefault(code, TDigest()).update(prices)
+        self._store_digests(digests)
+
+    @api.model
+    def _estimate_line_stats(self, digest, unit_price):
+        """Quartiles and competitiveness rank of a price, None without enough history
+
+        The local rank is the share of historical prices of the code below
+        unit_price, from 0 to 1. It is not the ibiDs rank, which compares the
+        numbers of tenders and offers for the code; it only stands in for it
+        on the same scale, cheap offers ranking low, when ibiDs sends none.
+        """
+        if not digest or digest.count < MIN_PRICE_SAMPLES:
+            return None
+        return {
+            'avahi_price_25_quartile': digest.quantile(0.25),
+            'avahi_price_75_quartile': digest.quantile(0.75),
+            'competitiveness_rank': digest.cdf(unit_price) if unit_price else 0.0,
+            'local_price_stats': True,
+        }
+
+    @api.model
+    def _fill_missing_line_stats(self, line_vals_list):
+        """Fill quartiles and rank the API omitted in tender line values, in place"""
+        missing = []
+        for line_vals in line_vals_list:
+            if line_vals.get('avahi_price_25_quartile') or line_vals.get('avahi_price_75_quartile') \
+                    or line_vals.get('competitiveness_rank') or not line_vals.get('unspsc_code'):
+                line_vals['local_price_stats'] = False
+            else:
+                missing.append(line_vals)
+        if not missing:
+            return line_vals_list
+
+        digests = self._get_digests({line_vals['unspsc_code'] for line_vals in missing})
+        for line_vals in missing:
+            estimate = self._estimate_line_stats(digests.get(line_vals['unspsc_code']), line_vals.get('unit_price'))
+            line_vals.update(estimate or {'local_price_stats': False})
+        return line_vals_list
+
+    @api.model
+    def _rebuild_statistics(self, chunk_size=REBUILD_CHUNK_SIZE):
+        """Rebuild every digest from all tender lines, then refresh locally estimated lines
+
+        Lines are streamed in keyset chunks and prices are buffered per code
+        so each digest merge sorts a batch at a time. Returns the number of
+        UNSPSC codes with statistics.
+        """
+        cr = self.env.cr
+        digests = {}
+        buffers = {}
+        last_id = 0
+        while True:
+            cr.execute("""
+                SELECT id, unspsc_code, unit_price FROM govcon_tender_line
+                 WHERE id > %s AND unspsc_code IS NOT NULL AND unit_price > 0
+                 ORDER BY id LIMIT %s
+            """, (last_id, chunk_size))
+            rows = cr.fetchall()
+            if not rows:
+                break
+            for line_id, code, unit_price in rows:
+                buffer = buffers.setdefault(code, [])
+                buffer.append(unit_price)
+                if len(buffer) >= REBUILD_BUFFER_SIZE:
+                    digests.setdefault(code, TDigest()).update(buffer)
+                    buffers[code] = []
+            last_id = rows[-1][0]
+        for code, buffer in buffers.items():
+            digests.setdefault(code, TDigest()).update(buffer)
+
+        self.search([('unspsc_code', 'not in', list(digests))]).unlink()
+        self._store_digests(digests)
+        self._refresh_local_line_stats(digests, chunk_size)
+        return len(digests)
+
+    @api.model
+    def _refresh_local_line_stats(self, digests, chunk_size=REBUILD_CHUNK_SIZE):
+        """Re-estimate lines filled locally and lines the API left without statistics"""
+        cr = self.env.cr
+        Line = self.env['govcon.tender.line']
+        Line.flush(['avahi_price_25_quartile', 'avahi_price_75_quartile', 'competitiveness_rank', 'local_price_stats'])
+        updated_ids = []
+        last_id = 0
+        while True:
+            cr.execute("""
+                SELECT id, unspsc_code, COALESCE(unit_price, 0) FROM govcon_tender_line
+                 WHERE id > %s AND unspsc_code IS NOT NULL
+                   AND (local_price_stats OR (COALESCE(avahi_price_25_quartile, 0) = 0
+                        AND COALESCE(avahi_price_75_quartile, 0) = 0 AND COALESCE(competitiveness_rank, 0) = 0))
+                 ORDER BY id LIMIT %s
+            """, (last_id, chunk_size))
+            rows = cr.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            params = []
+            for line_id, code, unit_price in rows:
+                estimate = self._estimate_line_stats(digests.get(code), unit_price)
+                if estimate:
+                    params += [line_id, estimate['avahi_price_25_quartile'], estimate['avahi_price_75_quartile'],
+                               estimate['competitiveness_rank']]
+                    updated_ids.append(line_id)
+            if not params:
+                continue
+            values = ', '.join(['(%s, %s, %s, %s)'] * (len(params) // 4))
+            cr.execute(f"""
+                UPDATE govcon_tender_line AS line
+                   SET avahi_price_25_quartile = data.price_25,
+                       avahi_price_75_quartile = data.price_75,
+                       competitiveness_rank = data.rank,
+                       local_price_stats = TRUE
+                  FROM (VALUES {values}) AS data(id, price_25, price_75, rank)
+                 WHERE line.id = data.id
+            """, params)
+
+        Line.invalidate_cache(['avahi_price_25_quartile', 'avahi_price_75_quartile', 'competitiveness_rank', 'local_price_stats'])
+        # The rank drives price competitiveness
+        Line._recompute_pricing_analytics(updated_ids)
+
+    @api.model
+    def _cron_rebuild_statistics(self):
+        """Cron job rebuilding the UNSPSC price statistics from all tender lines"""
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        code_count = self._rebuild_statistics()
+        _logger.info(f"Rebuilt UNSPSC price statistics for {code_count} codes")
+        if auto_commit:
+            self.env.cr.commit()
@@ -0,0 +1,3 @@
+from . import test_benchmark
+from . import test_email_extraction
+from . import test_sync_pagination
@@ -0,0 +1,174 @@
+import csv
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_logger = logging.getLogger(__name__)
+
+API_FIELDS_PATH = os.path.join(_path, 'api_fields')
+TENDER_FIELDS_FILE = 'ibids_api_swagger_fields - tender_data (1).csv'
+ARTICLE_FIELDS_FILE = 'ibids_api_swagger_fields - tender_articles.csv'
+
+# Article fields are listed without a datatype in the swagger export
+ARTICLE_NUMBER_FIELDS = {
+    'quantity', 'unit_price', 'ibids_estimated_price', 'avahi_price_25_quartile',
+    'avahi_price_75_quartile', 'competitiveness_rank',
+}
+
+# ----------------------------------------------------------
+# Decorators
+# ----------------------------------------------------------
+
+def track_function(max_query_count=None, max_query_time=None, max_time=None, return_tracking=False):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracking_parameters = [func.__name__]
+            threading.current_thread().query_time = 0
+            threading.current_thread().query_count = 0
+            threading.current_thread().perf_t0 = time.time()
+            result = func(*args, **kwargs)
+            message = "%s" % func.__name__
+            if hasattr(threading.current_thread(), 'query_count'):
+                query_count = threading.current_thread().query_count
+                query_time = threading.current_thread().query_time
+                perf_t0 = threading.current_thread().perf_t0
+                remaining_time = time.time() - perf_t0 - query_time
+                time_taken = query_time + remaining_time
+                message += " - {} Q {:.3f}s QT {:.3f}s OT {:.3f}s TT".format(
+                    query_count, query_time, remaining_time, time_taken)
+                tracking_parameters += [query_count, query_time, remaining_time, time_taken]
+                if max_query_count and query_count > max_query_count:
+                    raise AssertionError("More than %s queries" % max_query_count)
+                if max_query_time and query_time > max_query_time:
+                    raise AssertionError("Queries took longer than %.3fs" % max_query_time)
+                if max_time and time_taken > max_time:
+                    raise AssertionError("Function took longer than %.3fs" % max_time)
+            if not return_tracking:
+                _logger.info(message)
+            if return_tracking:
+                return result, tracking_parameters
+            return result
+        return wrapper
+    return decorator
+
+# ----------------------------------------------------------
+# Mock ibiDs API
+# ----------------------------------------------------------
+
+def load_api_fields(filename):
+    """Return [(field, datatype)] from an api_fields swagger export"""
+    with open(os.path.join(API_FIELDS_PATH, filename), newline='') as csv_file:
+        return [
+            (row['field'].replace(' ', ''), row.get('datatype') or '')
+            for row in csv.DictReader(csv_file)
+        ]
+
+
+class MockIbidsPayloads:
+    """Deterministic synthetic tenders and articles built from the API field lists"""
+
+    def __init__(self, tender_count, articles_per_tender=3):
+        self.tender_count = tender_count
+        self.articles_per_tender = articles_per_tender
+        self.tender_fields = load_api_fields(TENDER_FIELDS_FILE)
+        self.article_fields = [
+            (field, 'number' if field in ARTICLE_NUMBER_FIELDS else 'text')
+            for field, datatype in load_api_fields(ARTICLE_FIELDS_FILE)
+            if field not in ('tender_id', 'total_price')
+        ]
+
+    def _value(self, field, datatype, index):
+        if datatype == 'number':
+            return float((index * 37) % 100000) + 0.5
+        if datatype == 'boolean':
+            return index % 2 == 0
+        if datatype == 'datetime':
+            return '2025-%02d-%02d 10:00:00' % (index % 12 + 1, index % 28 + 1)
+        if datatype in ('url', 's3 link'):
+            return f'https://example.com/{field}/{index}'
+        return f'{field} {index}'
+
+    def tender_ref(self, index):
+        return f'BENCH-{index:07d}'
+
+    def tender(self, index):
+        tender = {field: self._value(field, datatype, index) for field, datatype in self.tender_fields}
+        tender['tender_id'] = self.tender_ref(index)
+        return tender
+
+    def tenders(self, page, page_size):
+        start = (page - 1) * page_size
+        return [self.tender(index) for index in range(start, min(start + page_size, self.tender_count))]
+
+    def articles(self, tender_ref):
+        index = int(tender_ref.split('-')[-1])
+        articles = []
+        for number in range(1, self.articles_per_tender + 1):
+            article = {
+                field: self._value(field, datatype, index + number)
+                for field, datatype in self.article_fields
+            }
+            article['article_number'] = str(number)
+            article['competitiveness_rank'] = ((index + number) % 10) / 10.0
+            articles.append(article)
+        return articles
+
+
+class MockIbidsApi:
+    """Local stand-in for the ibiDs /tenders and /tenders/{id}/articles endpoints"""
+
+    def __init__(self, payloads):
+        self.payloads = payloads
+        payloads_ref = payloads
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                parts = url.path.strip('/').split('/')
+                if parts == ['tenders']:
+                    body = {
+                        'results': payloads_ref.tenders(int(query['page'][0]), int(query['page_size'][0])),
+                        'total': payloads_ref.tender_count,
+                    }
+                elif len(parts) == 3 and parts[0] == 'tenders' and parts[2] == 'articles':
+                    body = payloads_ref.articles(parts[1])
+                elif parts == ['health']:
+                    body = {'status': 'ok'}
+                else:
+                    self.send_error(404)
+                    return
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%s' % self.server.server_address[1]
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
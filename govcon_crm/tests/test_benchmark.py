@@ -0,0 +1,80 @@
+import logging
+import os
+import unittest
+
+from odoo.tests import common, tagged
+
+from .common import API_FIELDS_PATH, MockIbidsApi, MockIbidsPayloads, track_function
+
+_logger = logging.getLogger(__name__)
+
+
+# This tests will only be executed if --test-tags benchmark is defined
+@tagged('-standard', 'benchmark')
+class SyncBenchmarkTestCase(common.SavepointCase):
+    @classmethod
+    def setUpClass(cls):
+        super(SyncBenchmarkTestCase, cls).setUpClass()
+        if not os.path.isdir(API_FIELDS_PATH):
+            raise unittest.SkipTest('api_fields swagger exports not found at %s' % API_FIELDS_PATH)
+
+    def _create_service(self, api_url):
+        return self.env['govcon.sync.service'].create({
+            'name': 'Benchmark Service',
+            'api_url': api_url,
+            'api_key': 'benchmark',
+            'sync_mode': 'full',
+            'page_size': 500,
+        })
+
+    def _run_queued_sync(self, service):
+        """Queue a sync run and drain it like the worker crons do"""
+        service._enqueue_sync()
+        self.env['govcon.sync.job']._cron_process_jobs(time_budget=3600)
+
+    def _benchmark_table(self, data):
+        columns = len(data[0]) - 1
+        formt = '{:12}' + '| {:28}' * columns
+
+        result = formt.format(*data[0]) + '\n'
+        result += ('-' * 12) + (('+' + ('-') * 29) * columns) + '\n'
+        for row in data[1:]:
+            result += formt.format(*row) + '\n'
+        return result
+
+    def _benchmark_sync(self, tender_count):
+        payloads = MockIbidsPayloads(tender_count)
+        with MockIbidsApi(payloads) as api:
+            service = self._create_service(api.url)
+            tsync = track_function(return_tracking=True)(self._run_queued_sync)
+
+            benchmark = ['%d' % tender_count]
+            for run in ('initial', 'unchanged'):
+                self.registry.clear_caches()
+                self.env.cache.invalidate()
+                tracking = tuple(tsync(service)[1][1:])
+                benchmark.append('%sq %.3fs %.3fs %.3fs' % tracking)
+                self.assertEqual(service.last_sync_status, 'success')
+
+        self.assertEqual(
+            self.env['govcon.tender'].search_count([('tender_id', '=like', 'BENCH-%')]),
+            tender_count,
+        )
+        info_message = '\n\nSyncing tenders from a local mock ibiDs API | '
+        info_message += '%d articles per tender\n\n' % payloads.articles_per_tender
+        info_message += self._benchmark_table([
+            ['Tenders', 'Initial Sync', 'Unchanged Re-sync'],
+            benchmark,
+        ])
+        info_message += '\nLegend: Queries | Query Time | Server Time | Total Time\n'
+        _logger.info(info_message)
+
+    def test_sync_benchmark_1k(self):
+        self._benchmark_sync(1000)
+
+    def test_sync_benchmark_10k(self):
+        self._benchmark_sync(10000)
+
+    @unittest.skip('Takes to long to be tested every time.')
+    def test_sync_benchmark_100k(self):
+        self._benchmark_sync(100000)
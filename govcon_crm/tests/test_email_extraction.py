@@ -0,0 +1,154 @@
+import re
+
+from odoo.tests import common
+
+from odoo.addons.govcon_crm.models.email_processor import (
+    _normalize_email_text, _scan_tender_fields, _split_digest,
+)
+
+# Field patterns of the original extraction, searched one by one in priority order
+LEGACY_PATTERNS = [
+    ('extracted_tender_id', [
+        r'tender[:\s]*([A-Z0-9\-]+)',
+        r'licitación[:\s]*([A-Z0-9\-]+)',
+        r'convocatoria[:\s]*([A-Z0-9\-]+)',
+        r'ID[:\s]*([A-Z0-9\-]+)',
+        r'Reference[:\s]*([A-Z0-9\-]+)',
+    ]),
+    ('extracted_entity', [
+        r'entidad[:\s]*([^,\n]+)',
+        r'entity[:\s]*([^,\n]+)',
+        r'procuring[:\s]*([^,\n]+)',
+        r'organismo[:\s]*([^,\n]+)',
+    ]),
+    ('extracted_value', [
+        r'valor[:\s]*\$?([0-9,]+\.?[0-9]*)',
+        r'value[:\s]*\$?([0-9,]+\.?[0-9]*)',
+        r'monto[:\s]*\$?([0-9,]+\.?[0-9]*)',
+        r'amount[:\s]*\$?([0-9,]+\.?[0-9]*)',
+    ]),
+    ('extracted_deadline', [
+        r'fecha límite[:\s]*([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4})',
+        r'deadline[:\s]*([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4})',
+        r'fecha de cierre[:\s]*([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4})',
+        r'closing date[:\s]*([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4})',
+    ]),
+]
+
+
+def legacy_extract(text):
+    """Fields extracted by the original per-pattern regex loop"""
+    extracted_data = {}
+    for field, patterns in LEGACY_PATTERNS:
+        for pattern in patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if not match:
+                continue
+            value = match.group(1)
+            if field == 'extracted_value':
+                try:
+                    extracted_data[field] = float(value.replace(',', ''))
+                except ValueError:
+                    continue
+            elif field == 'extracted_deadline':
+                parts = value.split('/') if '/' in value else value.split('-')
+                if len(parts[2]) == 2:
+                    parts[2] = '20' + parts[2]
+                extracted_data[field] = f"{parts[2]}-{parts[1]}-{parts[0]}"
+            elif field == 'extracted_entity':
+                extracted_data[field] = value.strip()
+            else:
+                extracted_data[field] = value
+            break
+    match = re.search(r'https?://[^\s<>"]+', text)
+    if match:
+        extracted_data['extracted_url'] = match.group(0)
+    return extracted_data
+
+
+PLAIN_EMAILS = [
+    ('New notice', 'Entidad: Ministerio de Salud, Bogotá\nTender: LIC-2024-001\nValor: $1,250,000.50\n'
+                   'Fecha límite: 15/03/2025\nSuministro de equipos médicos para hospitales regionales\n'
+                   'https://contratos.gov.co/LIC-2024-001'),
+    ('Reference RFQ-77 published', 'Procuring entity: City of Springfield\nAmount: 45000\n'
+                                   'Closing date: 1-2-25\nSee https://bids.example.com/rfq77?x=1 for details.'),
+    ('Convocatoria CONV-9', 'ID: OTHER-1\nLicitación: LIC-5\nOrganismo: Agencia Nacional\nMonto: 3,000\n'
+                            'Deadline: 31/12/24'),
+    ('Tender T-1', 'Valor: ,\nAmount: 99.5'),
+    ('Tender İD: X1', 'cloſing date: 03/04/25'),
+    ('Hello', 'Nothing relevant here at all'),
+]
+
+
+class EmailExtractionTestCase(common.SavepointCase):
+    def test_single_scan_matches_legacy_extraction(self):
+        for subject, body in PLAIN_EMAILS:
+            text = subject + ' ' + body
+            self.assertEqual(_scan_tender_fields(text), legacy_extract(text), text)
+
+    def test_html_email(self):
+        body = (
+            '<html><head><style>p {color: red}</style></head><body>'
+            '<p>Tender: HTML-42</p><p>Entity: Gobernación del Valle</p><p>Value: 7,500</p>'
+            '<a href="https://portal.example.org/HTML-42">Ver proceso</a></body></html>'
+        )
+        self.assertEqual(_scan_tender_fields('Aviso ' + _normalize_email_text(body)), {
+            'extracted_tender_id': 'HTML-42',
+            'extracted_entity': 'Gobernación del Valle',
+            'extracted_value': 7500.0,
+            'extracted_url': 'https://portal.example.org/HTML-42',
+        })
+
+    def test_digest_split_on_separators(self):
+        body = (
+            'Daily notices for your team\n---\n'
+            'Tender: D-1\nEntity: Alcaldía de Cali\nValue: 1,000\n'
+            'Construcción de vías terciarias en zona rural\nhttps://x.example/D-1\n---\n'
+            'Tender: D-2\nEntity: Gobernación de Antioquia\nDeadline: 05/06/2025\nhttps://x.example/D-2\n'
+        )
+        self.assertEqual(_split_digest(body), [{
+            'extracted_tender_id': 'D-1',
+            'extracted_entity': 'Alcaldía de Cali',
+            'extracted_value': 1000.0,
+            'extracted_url': 'https://x.example/D-1',
+            'extracted_description': 'Entity: Alcaldía de Cali',
+        }, {
+            'extracted_tender_id': 'D-2',
+            'extracted_entity': 'Gobernación de Antioquia',
+            'extracted_deadline': '2025-06-05',
+            'extracted_url': 'https://x.example/D-2',
+            'extracted_description': 'Entity: Gobernación de Antioquia',
+        }])
+
+    def test_digest_split_on_tender_id_lines(self):
+        body = (
+            'Resumen diario de licitaciones publicadas hoy\n'
+            '1. Licitación: L-10 Entidad: Municipio de Pasto\n   Valor: 2,500\n'
+            '2. Licitación: L-11 Entidad: Municipio de Tunja\n   Fecha de cierre: 10/10/25\n'
+        )
+        self.assertEqual(_split_digest(body), [{
+            'extracted_tender_id': 'L-10',
+            'extracted_entity': 'Municipio de Pasto',
+            'extracted_value': 2500.0,
+            'extracted_description': '1. Licitación: L-10 Entidad: Municipio de Pasto',
+        }, {
+            'extracted_tender_id': 'L-11',
+            'extracted_entity': 'Municipio de Tunja',
+            'extracted_deadline': '2025-10-10',
+            'extracted_description': '2. Licitación: L-11 Entidad: Municipio de Tunja',
+        }])
+
+    def test_html_digest(self):
+        body = (
+            '<p>Tender: H-1</p><p>Entity: Uno</p><hr>'
+            '<p>Tender: H-2</p><p>Entity: Dos</p><a href="https://h.example/2">link</a>'
+        )
+        self.assertEqual(_split_digest(_normalize_email_text(body)), [{
+            'extracted_tender_id': 'H-1',
+            'extracted_entity': 'Uno',
+        }, {
+            'extracted_tender_id': 'H-2',
+            'extracted_entity': 'Dos',
+            'extracted_url': 'https://h.example/2',
+            'extracted_description': 'https://h.example/2 link',
+        }])
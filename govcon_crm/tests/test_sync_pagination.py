@@ -0,0 +1,116 @@
+from unittest.mock import patch
+
+from odoo.exceptions import ValidationError
+from odoo.tests import common
+
+from odoo.addons.govcon_crm.models.sync_service import GovconSyncService
+
+
+class MockResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class MockSession:
+    """Serves the given /tenders payloads in order and records the query parameters"""
+
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.requests = []
+
+    def get(self, url, params=None, timeout=None):
+        self.requests.append(dict(params or {}))
+        return MockResponse(self.payloads[len(self.requests) - 1])
+
+
+class SyncPaginationTestCase(common.SavepointCase):
+    @classmethod
+    def setUpClass(cls):
+        super(SyncPaginationTestCase, cls).setUpClass()
+        cls.service = cls.env['govcon.sync.service'].create({
+            'name': 'Pagination Service',
+            'api_url': 'http://ibids.test',
+            'api_key': 'test',
+            'page_size': 2,
+        })
+
+    def _tenders(self, *refs):
+        return [{'tender_id': ref} for ref in refs]
+
+    def _fetch_pages(self, payloads):
+        """Return ([tender_id lists], request params) of a page iteration over payloads"""
+        session = MockSession(payloads)
+        with patch.object(GovconSyncService, '_get_api_session', return_value=session):
+            pages = [
+                [tender_info['tender_id'] for tender_info in tenders]
+                for tenders, next_params in self.service._fetch_tender_pages()
+            ]
+        return pages, session.requests
+
+    def test_bare_list_is_a_single_page(self):
+        pages, requests = self._fetch_pages([self._tenders('T1', 'T2')])
+        self.assertEqual(pages, [['T1', 'T2']])
+        self.assertEqual(len(requests), 1)
+
+    def test_full_page_without_pagination_fields_stops(self):
+        pages, requests = self._fetch_pages([{'results': self._tenders('T1', 'T2')}])
+        self.assertEqual(pages, [['T1', 'T2']])
+        self.assertEqual(len(requests), 1)
+
+    def test_has_more_follows_page_numbers(self):
+        pages, requests = self._fetch_pages([
+            {'results': self._tenders('T1', 'T2'), 'has_more': True},
+            {'results': self._tenders('T3'), 'has_more': False},
+        ])
+        self.assertEqual(pages, [['T1', 'T2'], ['T3']])
+        self.assertEqual([params['page'] for params in requests], [1, 2])
+
+    def test_next_field_follows_page_numbers(self):
+        pages, requests = self._fetch_pages([
+            {'data': self._tenders('T1', 'T2'), 'next': 'http://ibids.test/tenders?page=2'},
+            {'data': self._tenders('T3'), 'next': None},
+        ])
+        self.assertEqual(pages, [['T1', 'T2'], ['T3']])
+        self.assertEqual(len(requests), 2)
+
+    def test_total_counts_fetched_tenders(self):
+        # The API caps the page size below the requested one
+        pages, requests = self._fetch_pages([
+            {'results': self._tenders('T1'), 'total': 3},
+            {'results': self._tenders('T2'), 'total': 3},
+            {'results': self._tenders('T3'), 'total': 3},
+        ])
+        self.assertEqual(pages, [['T1'], ['T2'], ['T3']])
+        self.assertEqual([params['page'] for params in requests], [1, 2, 3])
+        for params in requests:
+            self.assertFalse(set(params) & set(GovconSyncService._page_state_keys))
+
+    def test_cursor_replaces_page_numbers(self):
+        pages, requests = self._fetch_pages([
+            {'results': self._tenders('T1', 'T2'), 'next_cursor': 'abc'},
+            {'results': self._tenders('T3')},
+        ])
+        self.assertEqual(pages, [['T1', 'T2'], ['T3']])
+        self.assertEqual(requests[1]['cursor'], 'abc')
+        self.assertNotIn('page', requests[1])
+
+    def test_empty_page_stops(self):
+        pages, requests = self._fetch_pages([
+            {'results': self._tenders('T1', 'T2'), 'has_more': True},
+            {'results': [], 'has_more': True},
+        ])
+        self.assertEqual(pages, [['T1', 'T2']])
+        self.assertEqual(len(requests), 2)
+
+    def test_repeated_page_aborts(self):
+        with self.assertRaises(ValidationError):
+            self._fetch_pages([
+                {'results': self._tenders('T1', 'T2'), 'has_more': True},
+                {'results': self._tenders('T2', 'T1'), 'has_more': True},
+            ])